@@ -3,8 +3,9 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_login import LoginManager
 from config import Config
+from app.utils.db_routing import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 migrate = Migrate()
 login_manager = LoginManager()
 
@@ -12,27 +13,60 @@ def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
 
+    if app.config['PROXY_FIX_HOPS']:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        hops = app.config['PROXY_FIX_HOPS']
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops, x_host=hops)
+
+    from app.utils.db_pool import engine_options, set_statement_timeout
+    pool_options = app.config['SQLALCHEMY_ENGINE_OPTIONS']
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config['SQLALCHEMY_DATABASE_URI'], pool_options)
+    # Binds don't inherit SQLALCHEMY_ENGINE_OPTIONS, so give the replica the same pool
+    app.config['SQLALCHEMY_BINDS'] = {
+        key: dict(engine_options(uri, pool_options), url=uri)
+        for key, uri in app.config['SQLALCHEMY_BINDS'].items()
+    }
+
     db.init_app(app)
+    with app.app_context():
+        for engine in db.engines.values():
+            set_statement_timeout(engine, app.config['DB_STATEMENT_TIMEOUT_MS'])
     migrate.init_app(app, db)
     login_manager.init_app(app)
 
     from app import models
-    from app.models import User
-    from app.routes import auth, passenger, admin
+    from app.routes import auth, passenger, admin, checkin
+    from app.utils.user_cache import load_identity
+    from app.utils.rate_limit import init_rate_limits
+    from app.utils.metrics import init_metrics
+    from app.utils.query_budget import init_query_budget
+    from app.utils.slow_query_log import init_slow_query_log
     from flask import render_template
 
     app.register_blueprint(auth.bp)
     app.register_blueprint(passenger.bp)
     app.register_blueprint(admin.bp)
+    app.register_blueprint(checkin.bp)
+
+    # Metrics first, so requests refused by the rate limiter are still counted
+    init_metrics(app, RoutingSession)
+    init_rate_limits(app)
+    init_query_budget(app)
+    init_slow_query_log(app)
 
 
     @app.errorhandler(403)
     def forbidden(e):
         return render_template('403.html'), 403
 
+    @app.errorhandler(429)
+    def too_many_requests(e):
+        headers = [header for header in e.get_headers() if header[0] == 'Retry-After']
+        return render_template('429.html'), 429, headers
+
     @login_manager.user_loader
     def load_user(user_id):
-        return User.query.get(int(user_id))
+        return load_identity(int(user_id))
 
     login_manager.login_view = "auth.login"
 
@@ -1,7 +1,8 @@
 from flask_wtf import FlaskForm
 from wtforms import StringField, PasswordField, SubmitField, SelectField, DateField, IntegerField, FloatField, BooleanField, TextAreaField, RadioField
-from wtforms.validators import DataRequired, Email, Length, EqualTo, ValidationError, NumberRange, Optional
-from wtforms import SelectField
+from wtforms.validators import DataRequired, Email, Length, EqualTo, ValidationError, NumberRange, Optional, InputRequired
+from wtforms import SelectField, SelectMultipleField
+from wtforms.widgets import ListWidget, CheckboxInput
 from datetime import datetime, date
 from app.models import SeatClass, TripType, FlightType, SeatPosition
 
@@ -167,11 +168,45 @@ class FlightForm(FlaskForm):
     timezone_diff = IntegerField('Timezone Difference (hours)', validators=[DataRequired()])
     submit = SubmitField('Schedule Flight')
 
+class FlightScheduleForm(FlaskForm):
+    flight_template_id = SelectField('Flight Template', coerce=int, validators=[DataRequired()])
+    start_date = DateField('First Departure Date', validators=[DataRequired()])
+    end_date = DateField('Last Departure Date', validators=[DataRequired()])
+    weekdays = SelectMultipleField('Operating Days', coerce=int,
+                                   choices=[(0, 'Mon'), (1, 'Tue'), (2, 'Wed'), (3, 'Thu'), (4, 'Fri'), (5, 'Sat'), (6, 'Sun')],
+                                   option_widget=CheckboxInput(), widget=ListWidget(prefix_label=False),
+                                   validators=[DataRequired(message='Select at least one day')])
+    departure_time = StringField('Departure Time', validators=[DataRequired()])
+    timezone_diff = IntegerField('Timezone Difference (hours)', validators=[InputRequired()])
+    submit = SubmitField('Publish Schedule')
+
+    def validate_end_date(self, field):
+        if self.start_date.data and field.data and field.data < self.start_date.data:
+            raise ValidationError('Last departure date must be on or after the first.')
+
+    def validate_departure_time(self, field):
+        try:
+            datetime.strptime(field.data, '%H:%M')
+        except ValueError:
+            raise ValidationError('Use HH:MM, e.g. 08:30.')
+
 class DiscountForm(FlaskForm):
     flight_id = SelectField('Flight', coerce=int, validators=[DataRequired()])
     discount_percentage = FloatField('Discount Percentage', validators=[DataRequired(), NumberRange(min=0, max=100)])
     submit = SubmitField('Apply Discount')
 
+class BulkDiscountForm(FlaskForm):
+    routes = SelectMultipleField('Routes', validators=[Optional()])
+    airline_id = SelectField('Airline', coerce=int, validators=[Optional()])
+    start_date = DateField('Departing From', validators=[DataRequired()])
+    end_date = DateField('Departing Until', validators=[DataRequired()])
+    discount_percentage = FloatField('Discount Percentage', validators=[DataRequired(), NumberRange(min=0, max=100)])
+    submit = SubmitField('Apply to Matching Flights')
+
+    def validate_end_date(self, field):
+        if self.start_date.data and field.data and field.data < self.start_date.data:
+            raise ValidationError('End date must be on or after the start date.')
+
 class PriceForm(FlaskForm):
     economy_price = FloatField('Economy Price', validators=[DataRequired(), NumberRange(min=0)])
     business_price = FloatField('Business Price', validators=[DataRequired(), NumberRange(min=0)])
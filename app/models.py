@@ -2,8 +2,9 @@ from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 from enum import Enum
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import check_password_hash
 from app import db
+from app.utils.password_hashing import hash_password, needs_rehash
 
 # Enums
 class SeatClass(Enum):
@@ -32,6 +33,10 @@ class FlightType(Enum):
 # 1. Users
 class User(UserMixin, db.Model):
     __tablename__ = 'users'
+    __table_args__ = (
+        # Admin user search (utils/user_search.py); other databases use FTS5 or no index
+        db.Index('ft_users_name_email', 'name', 'email', mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
+    )
     user_id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(120), nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
@@ -41,10 +46,15 @@ class User(UserMixin, db.Model):
     reservations = db.relationship("Reservation", backref="user", lazy=True)
 
     def set_password(self, password):
-        self.password = generate_password_hash(password)
+        self.password = hash_password(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password, password)
+        """Verify a password, rehashing it if the configured cost has changed. The caller commits."""
+        if not check_password_hash(self.password, password):
+            return False
+        if needs_rehash(self.password):
+            self.password = hash_password(password)
+        return True
 
     def __repr__(self):
         return f"<User {self.email}>"
@@ -91,10 +101,10 @@ class Aircraft(db.Model):
 class Airport(db.Model):
     __tablename__ = 'airports'
     airport_id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(100), nullable=False)
+    name = db.Column(db.String(100), nullable=False, index=True)
     city = db.Column(db.String(50), nullable=False)
     country = db.Column(db.String(50), nullable=False)
-    IATA_code = db.Column(db.String(10), nullable=False)
+    IATA_code = db.Column(db.String(10), nullable=False, index=True)
     ICAO_code = db.Column(db.String(10), nullable=False)
 
 # 6. Flight Templates
@@ -103,7 +113,7 @@ class FlightTemplate(db.Model):
     flight_template_id = db.Column(db.Integer, primary_key=True)
     airline_id = db.Column(db.Integer, db.ForeignKey('airlines.airline_id'), nullable=False)
     aircraft_id = db.Column(db.Integer, db.ForeignKey('aircrafts.aircraft_id'), nullable=False)
-    flight_number = db.Column(db.String(10), nullable=False)
+    flight_number = db.Column(db.String(10), nullable=False, index=True)
     departure_airport_id = db.Column(db.Integer, db.ForeignKey('airports.airport_id'), nullable=False)
     arrival_airport_id = db.Column(db.Integer, db.ForeignKey('airports.airport_id'), nullable=False)
     duration = db.Column(db.Time, nullable=False)
@@ -120,9 +130,12 @@ class FlightTemplate(db.Model):
 # 7. Flights (Scheduled)
 class Flight(db.Model):
     __tablename__ = 'flights'
+    __table_args__ = (
+        db.Index('ix_flights_template_departure', 'flight_template_id', 'departure_datetime'),
+    )
     flight_id = db.Column(db.Integer, primary_key=True)
     flight_template_id = db.Column(db.Integer, db.ForeignKey('flight_template.flight_template_id'), nullable=False)
-    departure_datetime = db.Column(db.DateTime, nullable=False)
+    departure_datetime = db.Column(db.DateTime, nullable=False, index=True)
     arrival_datetime = db.Column(db.DateTime, nullable=False)
     timezone_diff = db.Column(db.Integer, nullable=False)
     is_active = db.Column(db.Boolean, default=True, nullable=False)
@@ -170,6 +183,9 @@ class ReservationSeat(db.Model):
     passenger_id = db.Column(db.Integer, db.ForeignKey('passengers.passenger_id'), primary_key=True)
     seat_id = db.Column(db.Integer, db.ForeignKey('seats.seat_id'), nullable=False)
 
+    passenger = db.relationship("Passenger")
+    seat = db.relationship("Seat")
+
 # 12. Invoices
 class Invoice(db.Model):
     __tablename__ = 'invoices'
@@ -181,6 +197,31 @@ class Invoice(db.Model):
 # 13. Discounts
 class Discount(db.Model):
     __tablename__ = 'discounts'
+    __table_args__ = (
+        db.UniqueConstraint('flight_id', name='uq_discounts_flight_id'),
+    )
     discount_id = db.Column(db.Integer, primary_key=True)
     flight_id = db.Column(db.Integer, db.ForeignKey('flights.flight_id'), nullable=False)
     discount_percentage = db.Column(db.Float, nullable=False)
+
+# 14. Daily Revenue (rollup kept up to date on booking and refund)
+class DailyRevenue(db.Model):
+    __tablename__ = 'daily_revenue'
+    date = db.Column(db.Date, primary_key=True)
+    airline_id = db.Column(db.Integer, db.ForeignKey('airlines.airline_id'), primary_key=True)
+    route = db.Column(db.String(25), primary_key=True)
+    class_ = db.Column(db.Enum(SeatClass), primary_key=True)
+    bookings = db.Column(db.Integer, nullable=False, default=0)
+    gross = db.Column(db.Float, nullable=False, default=0)
+    refunds = db.Column(db.Float, nullable=False, default=0)
+
+# 15. Notifications (outbox of passenger messages awaiting delivery)
+class Notification(db.Model):
+    __tablename__ = 'notifications'
+    notification_id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.user_id'), nullable=False)
+    reservation_id = db.Column(db.Integer, db.ForeignKey('reservations.reservation_id'))
+    flight_id = db.Column(db.Integer, db.ForeignKey('flights.flight_id'))
+    kind = db.Column(db.String(30), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    sent_at = db.Column(db.DateTime, index=True)
@@ -1,7 +1,27 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+import io
+from flask import Blueprint, Response, render_template, request, redirect, url_for, flash, jsonify, send_file, current_app, abort, stream_with_context
 from flask_login import login_required, current_user
 from app.utils.auth_helper import role_required
-from app.forms import FlightTemplateForm, FlightForm, DiscountForm, PriceForm
+from app.utils.ticket_batch import render_flight_tickets
+from app.utils.ticket_data import load_flight_documents, load_flight_info
+from app.utils.revenue_rollup import revenue_totals, revenue_by_month
+from app.utils.revenue_breakdown import revenue_breakdown
+from app.utils.flight_schedule import MAX_SCHEDULE_DAYS, schedule_departures, find_clashes, create_scheduled_flights
+from app.utils.admin_lookup import search_flights, flight_choice, search_templates, template_choice
+from app.utils.booking_history import booking_history, booking_totals
+from app.utils.csv_export import (
+    RESERVATION_COLUMNS, MANIFEST_COLUMNS, INVOICE_COLUMNS,
+    stream_csv, reservation_rows, manifest_rows, invoice_rows
+)
+from app.utils.user_search import USERS_PER_PAGE, search_users, booking_counts
+from app.utils.flight_cancellation import cancel_flights
+from app.utils.ticket_token import load_revocations
+from app.utils.user_cache import forget_user
+from app.utils.db_pool import pool_stats
+from app.utils.db_routing import read_replica
+from app.utils.slow_query_log import slow_query_summary
+from app.utils.bulk_discount import route_choices, matching_flights, apply_discount
+from app.forms import FlightTemplateForm, FlightForm, FlightScheduleForm, DiscountForm, BulkDiscountForm, PriceForm
 from app.models import (
     User, Passenger, Airline, Airport, Aircraft, FlightTemplate, Flight, 
     Price, Seat, Reservation, ReservationSeat, Invoice, Discount,
@@ -9,20 +29,35 @@ from app.models import (
 )
 from app import db
 from datetime import datetime, timedelta
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func, and_, or_, case, select
+from sqlalchemy.orm import contains_eager
 import json
 
 bp = Blueprint('admin', __name__, url_prefix='/admin')
 
+
+def _parse_date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+    except ValueError:
+        return None
+
+
+def _flight_counts():
+    total, active = db.session.query(
+        func.count(Flight.flight_id),
+        func.sum(case((Flight.is_active == True, 1), else_=0))
+    ).one()
+    return total or 0, active or 0
+
+
 @bp.route('/dashboard')
 @login_required
 @role_required('admin')
 def admin_dashboard():
     # Calculate analytics
-    total_revenue = db.session.query(func.sum(Invoice.amount)).scalar() or 0
-    total_tickets = db.session.query(func.count(Reservation.reservation_id)).scalar() or 0
-    total_flights = db.session.query(func.count(Flight.flight_id)).scalar() or 0
-    active_flights = db.session.query(func.count(Flight.flight_id)).filter(Flight.is_active == True).scalar() or 0
+    total_revenue, total_tickets = revenue_totals()
+    total_flights, active_flights = _flight_counts()
     
     # Most popular routes - Fixed join ambiguity
     popular_routes = db.session.query(
@@ -36,24 +71,11 @@ def admin_dashboard():
         FlightTemplate.arrival_airport_id
     ).order_by(func.count(ReservationSeat.reservation_id).desc()).limit(5).all()
     
-    # Revenue by month (last 6 months)
-    monthly_revenue = []
-    for i in range(6):
-        month_start = datetime.utcnow().replace(day=1) - timedelta(days=30*i)
-        month_end = month_start.replace(day=28) + timedelta(days=4)
-        month_end = month_end.replace(day=1) - timedelta(days=1)
-        
-        revenue = db.session.query(func.sum(Invoice.amount)).filter(
-            and_(
-                Invoice.issued_date >= month_start,
-                Invoice.issued_date <= month_end
-            )
-        ).scalar() or 0
-        
-        monthly_revenue.append({
-            'month': month_start.strftime('%B %Y'),
-            'revenue': revenue
-        })
+    # Revenue by calendar month (last 6 months), read from the daily rollup
+    monthly_revenue = [
+        {'month': month_start.strftime('%B %Y'), 'revenue': revenue}
+        for month_start, revenue in revenue_by_month(6)
+    ]
     
     # Recent bookings
     recent_bookings = Reservation.query.order_by(Reservation.reservation_date.desc()).limit(10).all()
@@ -75,12 +97,95 @@ def admin_dashboard():
                          recent_bookings=recent_bookings,
                          flight_status=flight_status)
 
+FLIGHTS_PER_PAGE = 50
+
+
+def _flight_cursor(flight):
+    return f"{flight.departure_datetime.isoformat()}_{flight.flight_id}"
+
+
+def _parse_flight_cursor(value):
+    try:
+        departure, flight_id = value.rsplit('_', 1)
+        return datetime.fromisoformat(departure), int(flight_id)
+    except (AttributeError, ValueError):
+        return None
+
+
 @bp.route('/flights')
 @login_required
 @role_required('admin')
+@read_replica
 def manage_flights():
-    flights = Flight.query.order_by(Flight.departure_datetime.desc()).all()
-    return render_template('admin/flights.html', flights=flights)
+    filters = {
+        'departure_airport_id': request.args.get('departure_airport_id', type=int),
+        'arrival_airport_id': request.args.get('arrival_airport_id', type=int),
+        'airline_id': request.args.get('airline_id', type=int),
+        'date_from': _parse_date(request.args.get('date_from')),
+        'date_to': _parse_date(request.args.get('date_to')),
+        'active': request.args.get('active', ''),
+    }
+
+    # Templates, airlines and airports are joined into the page query so the
+    # table renders without a lazy load per row
+    query = Flight.query.join(Flight.flight_template).options(
+        contains_eager(Flight.flight_template).joinedload(FlightTemplate.airline),
+        contains_eager(Flight.flight_template).joinedload(FlightTemplate.departure_airport),
+        contains_eager(Flight.flight_template).joinedload(FlightTemplate.arrival_airport),
+    )
+
+    if filters['departure_airport_id']:
+        query = query.filter(FlightTemplate.departure_airport_id == filters['departure_airport_id'])
+    if filters['arrival_airport_id']:
+        query = query.filter(FlightTemplate.arrival_airport_id == filters['arrival_airport_id'])
+    if filters['airline_id']:
+        query = query.filter(FlightTemplate.airline_id == filters['airline_id'])
+    if filters['date_from']:
+        query = query.filter(Flight.departure_datetime >= filters['date_from'])
+    if filters['date_to']:
+        query = query.filter(Flight.departure_datetime < filters['date_to'] + timedelta(days=1))
+    if filters['active'] in ('1', '0'):
+        query = query.filter(Flight.is_active == (filters['active'] == '1'))
+
+    # Keyset pagination on (departure_datetime, flight_id), newest first
+    after = _parse_flight_cursor(request.args.get('after'))
+    before = _parse_flight_cursor(request.args.get('before'))
+    if before:
+        query = query.filter(
+            or_(Flight.departure_datetime > before[0],
+                and_(Flight.departure_datetime == before[0], Flight.flight_id > before[1]))
+        ).order_by(Flight.departure_datetime.asc(), Flight.flight_id.asc())
+    else:
+        if after:
+            query = query.filter(
+                or_(Flight.departure_datetime < after[0],
+                    and_(Flight.departure_datetime == after[0], Flight.flight_id < after[1]))
+            )
+        query = query.order_by(Flight.departure_datetime.desc(), Flight.flight_id.desc())
+
+    flights = query.limit(FLIGHTS_PER_PAGE + 1).all()
+    has_more = len(flights) > FLIGHTS_PER_PAGE
+    flights = flights[:FLIGHTS_PER_PAGE]
+    if before:
+        flights.reverse()
+
+    next_cursor = prev_cursor = None
+    if flights:
+        if has_more or before:
+            next_cursor = _flight_cursor(flights[-1])
+        if (before and has_more) or after:
+            prev_cursor = _flight_cursor(flights[0])
+
+    filter_args = {k: v for k, v in request.args.items() if k not in ('after', 'before') and v}
+
+    return render_template('admin/flights.html',
+                           flights=flights,
+                           filters=filters,
+                           filter_args=filter_args,
+                           next_cursor=next_cursor,
+                           prev_cursor=prev_cursor,
+                           airlines=Airline.query.order_by(Airline.name).all(),
+                           airports=Airport.query.order_by(Airport.IATA_code).all())
 
 @bp.route('/flights/add', methods=['GET', 'POST'])
 @login_required
@@ -88,9 +193,9 @@ def manage_flights():
 def add_flight():
     form = FlightForm()
     
-    # Populate flight template choices
-    templates = FlightTemplate.query.all()
-    form.flight_template_id.choices = [(t.flight_template_id, f"{t.flight_number} - {t.departure_airport.name} to {t.arrival_airport.name}") for t in templates]
+    # Only the selected template is rendered; the picker fetches the rest
+    selected = request.form.get('flight_template_id', type=int) or request.args.get('template_id', type=int)
+    form.flight_template_id.choices = template_choice(selected)
     
     if form.validate_on_submit():
         try:
@@ -118,6 +223,50 @@ def add_flight():
     
     return render_template('admin/add_flight.html', form=form)
 
+@bp.route('/flights/schedule', methods=['GET', 'POST'])
+@login_required
+@role_required('admin')
+def schedule_flights():
+    form = FlightScheduleForm()
+
+    # Only the selected template is rendered; the picker fetches the rest
+    form.flight_template_id.choices = template_choice(request.form.get('flight_template_id', type=int))
+
+    if form.validate_on_submit():
+        if (form.end_date.data - form.start_date.data).days >= MAX_SCHEDULE_DAYS:
+            flash(f'A schedule can cover at most {MAX_SCHEDULE_DAYS} days.', 'danger')
+            return render_template('admin/schedule_flights.html', form=form)
+
+        template = FlightTemplate.query.get(form.flight_template_id.data)
+        departure_time = datetime.strptime(form.departure_time.data, '%H:%M').time()
+        departures = schedule_departures(form.start_date.data, form.end_date.data,
+                                         form.weekdays.data, departure_time)
+        if not departures:
+            flash('No operating days fall within the selected dates.', 'warning')
+            return render_template('admin/schedule_flights.html', form=form)
+
+        try:
+            clashes = find_clashes(template.flight_template_id, departures)
+            created = create_scheduled_flights(
+                template, [d for d in departures if d not in clashes], form.timezone_diff.data
+            )
+            db.session.commit()
+
+            if created:
+                flash(f'Scheduled {created} {template.flight_number} flights.', 'success')
+            if clashes:
+                skipped = ', '.join(d.strftime('%Y-%m-%d %H:%M') for d in sorted(clashes)[:5])
+                more = f' and {len(clashes) - 5} more' if len(clashes) > 5 else ''
+                flash(f'Skipped {len(clashes)} departures that already exist: {skipped}{more}.', 'warning')
+            return redirect(url_for('admin.manage_flights', departure_airport_id=template.departure_airport_id,
+                                    arrival_airport_id=template.arrival_airport_id))
+
+        except Exception as e:
+            db.session.rollback()
+            flash('An error occurred while publishing the schedule.', 'danger')
+
+    return render_template('admin/schedule_flights.html', form=form)
+
 @bp.route('/flights/<int:flight_id>/toggle', methods=['POST'])
 @login_required
 @role_required('admin')
@@ -137,6 +286,56 @@ def toggle_flight(flight_id):
     
     return redirect(url_for('admin.manage_flights'))
 
+@bp.route('/flights/cancel', methods=['POST'])
+@login_required
+@role_required('admin')
+def cancel_flights_route():
+    flight_ids = request.form.getlist('flight_ids', type=int)
+    if not flight_ids:
+        flash('Select at least one flight to cancel.', 'warning')
+        return redirect(url_for('admin.manage_flights'))
+    
+    try:
+        cancelled_flights, cancelled = cancel_flights(flight_ids)
+        db.session.commit()
+        load_revocations()
+        
+        skipped = len(set(flight_ids)) - len(cancelled_flights)
+        if cancelled_flights:
+            flash(f'Cancelled {len(cancelled_flights)} flight(s) and refunded {cancelled} booking(s). '
+                  f'Passengers will be notified.', 'success')
+        if skipped:
+            flash(f'Skipped {skipped} flight(s) that have already departed or are not active.', 'warning')
+        
+    except Exception as e:
+        db.session.rollback()
+        flash('An error occurred while cancelling the flights.', 'danger')
+    
+    return redirect(url_for('admin.manage_flights'))
+
+@bp.route('/flights/<int:flight_id>/tickets')
+@login_required
+@role_required('admin')
+def download_flight_tickets(flight_id):
+    flight = load_flight_info(flight_id)
+    if flight is None:
+        abort(404)
+
+    documents = load_flight_documents(flight_id)
+    if not documents:
+        flash('No confirmed passengers on this flight.', 'warning')
+        return redirect(url_for('admin.manage_flights'))
+
+    archive = render_flight_tickets(flight, documents,
+                                    workers=current_app.config['TICKET_RENDER_WORKERS'])
+
+    return send_file(
+        io.BytesIO(archive),
+        as_attachment=True,
+        download_name=f"{flight.flight_number}-{flight.departure_datetime.strftime('%Y%m%d')}-tickets.zip",
+        mimetype='application/zip'
+    )
+
 @bp.route('/flights/<int:flight_id>/edit', methods=['GET', 'POST'])
 @login_required
 @role_required('admin')
@@ -144,9 +343,9 @@ def edit_flight(flight_id):
     flight = Flight.query.get_or_404(flight_id)
     form = FlightForm(obj=flight)
     
-    # Populate flight template choices
-    templates = FlightTemplate.query.all()
-    form.flight_template_id.choices = [(t.flight_template_id, f"{t.flight_number} - {t.departure_airport.name} to {t.arrival_airport.name}") for t in templates]
+    # Only the selected template is rendered; the picker fetches the rest
+    selected = request.form.get('flight_template_id', type=int) or flight.flight_template_id
+    form.flight_template_id.choices = template_choice(selected)
     
     if form.validate_on_submit():
         try:
@@ -174,6 +373,85 @@ def edit_flight(flight_id):
     
     return render_template('admin/edit_flight.html', form=form, flight=flight)
 
+def _csv_response(filename, columns, rows):
+    return Response(
+        stream_with_context(stream_csv(columns, rows)),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
+
+@bp.route('/exports/reservations.csv')
+@login_required
+@role_required('admin')
+@read_replica
+def export_reservations():
+    start = _parse_date(request.args.get('start'))
+    end = _parse_date(request.args.get('end'))
+    return _csv_response(f"reservations-{start or 'all'}-{end or 'all'}.csv",
+                         RESERVATION_COLUMNS, reservation_rows(start, end))
+
+@bp.route('/exports/invoices.csv')
+@login_required
+@role_required('admin')
+@read_replica
+def export_invoices():
+    start = _parse_date(request.args.get('start'))
+    end = _parse_date(request.args.get('end'))
+    return _csv_response(f"invoices-{start or 'all'}-{end or 'all'}.csv",
+                         INVOICE_COLUMNS, invoice_rows(start, end))
+
+@bp.route('/flights/<int:flight_id>/manifest.csv')
+@login_required
+@role_required('admin')
+@read_replica
+def export_manifest(flight_id):
+    flight = load_flight_info(flight_id)
+    if flight is None:
+        abort(404)
+    return _csv_response(f"{flight.flight_number}-{flight.departure_datetime.strftime('%Y%m%d')}-manifest.csv",
+                         MANIFEST_COLUMNS, manifest_rows(flight_id))
+
+@bp.route('/slow-queries')
+@login_required
+@role_required('admin')
+def slow_queries():
+    return render_template('admin/slow_queries.html',
+                           enabled=current_app.config['SLOW_QUERY_LOG_ENABLED'],
+                           threshold_ms=current_app.config['SLOW_QUERY_THRESHOLD_MS'],
+                           summary=slow_query_summary(current_app))
+
+@bp.route('/pool-stats')
+@login_required
+@role_required('admin')
+def pool_stats_route():
+    max_overflow = current_app.config['SQLALCHEMY_ENGINE_OPTIONS'].get('max_overflow')
+    stats = pool_stats(db.engine, max_overflow)
+    if 'replica' in db.engines:
+        stats['replica'] = pool_stats(db.engines['replica'], max_overflow)
+    return jsonify(stats)
+
+@bp.route('/lookup/flights')
+@login_required
+@role_required('admin')
+def lookup_flights():
+    results, next_after = search_flights(request.args.get('q', '').strip(),
+                                         after=request.args.get('after', type=int))
+    return jsonify({
+        'results': [{'id': id, 'text': text} for id, text in results],
+        'next': next_after
+    })
+
+@bp.route('/lookup/templates')
+@login_required
+@role_required('admin')
+def lookup_templates():
+    results, next_after = search_templates(request.args.get('q', '').strip(),
+                                           after=request.args.get('after', type=int))
+    return jsonify({
+        'results': [{'id': id, 'text': text} for id, text in results],
+        'next': next_after
+    })
+
 @bp.route('/templates')
 @login_required
 @role_required('admin')
@@ -290,24 +568,13 @@ def manage_discounts():
 def add_discount():
     form = DiscountForm()
     
-    # Populate flight choices (only active flights)
-    flights = Flight.query.filter(Flight.is_active == True).all()
-    form.flight_id.choices = [(f.flight_id, f"{f.flight_template.flight_number} - {f.departure_datetime.strftime('%Y-%m-%d %H:%M')}") for f in flights]
+    # Only the selected flight is rendered; the picker fetches the rest
+    form.flight_id.choices = flight_choice(request.form.get('flight_id', type=int))
     
     if form.validate_on_submit():
         try:
-            # Check if discount already exists for this flight
-            existing_discount = Discount.query.filter_by(flight_id=form.flight_id.data).first()
-            
-            if existing_discount:
-                existing_discount.discount_percentage = form.discount_percentage.data
-            else:
-                discount = Discount(
-                    flight_id=form.flight_id.data,
-                    discount_percentage=form.discount_percentage.data
-                )
-                db.session.add(discount)
-            
+            apply_discount(select(Flight.flight_id).where(Flight.flight_id == form.flight_id.data),
+                           form.discount_percentage.data)
             db.session.commit()
             flash('Discount applied successfully!', 'success')
             return redirect(url_for('admin.manage_discounts'))
@@ -318,6 +585,36 @@ def add_discount():
     
     return render_template('admin/add_discount.html', form=form)
 
+@bp.route('/discounts/bulk', methods=['GET', 'POST'])
+@login_required
+@role_required('admin')
+def bulk_discount():
+    form = BulkDiscountForm()
+    form.routes.choices = route_choices()
+    form.airline_id.choices = [(0, 'All airlines')] + [(a.airline_id, a.name) for a in Airline.query.order_by(Airline.name).all()]
+
+    if form.validate_on_submit():
+        try:
+            flights = matching_flights(routes=form.routes.data,
+                                       airline_id=form.airline_id.data,
+                                       start_date=form.start_date.data,
+                                       end_date=form.end_date.data)
+            updated, inserted = apply_discount(flights, form.discount_percentage.data)
+            db.session.commit()
+
+            if updated or inserted:
+                flash(f'Discount applied to {updated + inserted} flights '
+                      f'({inserted} new, {updated} updated).', 'success')
+            else:
+                flash('No active flights matched the selected filters.', 'warning')
+            return redirect(url_for('admin.manage_discounts'))
+
+        except Exception as e:
+            db.session.rollback()
+            flash('An error occurred while applying the discount.', 'danger')
+
+    return render_template('admin/bulk_discount.html', form=form)
+
 @bp.route('/discounts/<int:discount_id>/delete', methods=['POST'])
 @login_required
 @role_required('admin')
@@ -387,12 +684,11 @@ def delete_discount(discount_id):
 @bp.route('/analytics')
 @login_required
 @role_required('admin')
+@read_replica
 def analytics():
     # Revenue analytics
-    total_revenue = db.session.query(func.sum(Invoice.amount)).scalar() or 0
-    total_tickets = db.session.query(func.count(Reservation.reservation_id)).scalar() or 0
-    total_flights = db.session.query(func.count(Flight.flight_id)).scalar() or 0
-    active_flights = db.session.query(func.count(Flight.flight_id)).filter(Flight.is_active == True).scalar() or 0
+    total_revenue, total_tickets = revenue_totals()
+    total_flights, active_flights = _flight_counts()
     
     # Calculate profit as 2% of total revenue
     profit = total_revenue * 0.02
@@ -409,28 +705,27 @@ def analytics():
         FlightTemplate.arrival_airport_id
     ).order_by(func.count(ReservationSeat.reservation_id).desc()).limit(5).all()
     
-    # Monthly revenue (last 6 months)
-    monthly_revenue = []
-    for i in range(6):
-        month_start = datetime.utcnow().replace(day=1) - timedelta(days=30*i)
-        month_end = month_start.replace(day=28) + timedelta(days=4)
-        month_end = month_end.replace(day=1) - timedelta(days=1)
-        
-        revenue = db.session.query(func.sum(Invoice.amount)).filter(
-            and_(
-                Invoice.issued_date >= month_start,
-                Invoice.issued_date <= month_end
-            )
-        ).scalar() or 0
-        
-        monthly_revenue.append({
-            'month': month_start.strftime('%b %Y'),
-            'revenue': revenue
-        })
+    # Monthly revenue (last 6 calendar months)
+    monthly_revenue = [
+        {'month': month_start.strftime('%b %Y'), 'revenue': revenue}
+        for month_start, revenue in revenue_by_month(6)
+    ]
     
     monthly_revenue.reverse()  # so oldest month is first
     
+    # Breakdown by airline / route / class / flight type for the selected departure
+    # dates (default: flights of the last and the next 30 days)
+    today = datetime.utcnow().date()
+    start_date = _parse_date(request.args.get('start')) or today - timedelta(days=30)
+    end_date = _parse_date(request.args.get('end')) or today + timedelta(days=30)
+    if start_date > end_date:
+        start_date, end_date = end_date, start_date
+    breakdown = revenue_breakdown(start_date, end_date)
+    
     return render_template('admin/analytics.html',
+                         start_date=start_date,
+                         end_date=end_date,
+                         breakdown=breakdown,
                          total_revenue=total_revenue,
                          profit=profit,
                          total_tickets=total_tickets,
@@ -447,23 +742,13 @@ def manage_users():
     # Get search parameters
     search = request.args.get('search', '')
     role = request.args.get('role', '')
+    page = request.args.get('page', 1, type=int)
     
-    # Build query
-    query = User.query
+    users, total = search_users(search, role=role or None, page=page)
     
-    if search:
-        query = query.filter(
-            or_(
-                User.name.ilike(f'%{search}%'),
-                User.email.ilike(f'%{search}%')
-            )
-        )
-    
-    if role:
-        query = query.filter(User.role == role)
-    
-    users = query.all()
-    return render_template('admin/users.html', users=users)
+    return render_template('admin/users.html', users=users,
+                           booking_counts=booking_counts([user.user_id for user in users]),
+                           page=page, total=total, per_page=USERS_PER_PAGE)
 
 @bp.route('/users/<int:user_id>/toggle-role', methods=['POST'])
 @login_required
@@ -478,6 +763,7 @@ def toggle_user_role(user_id):
     try:
         user.role = 'admin' if user.role == 'passenger' else 'passenger'
         db.session.commit()
+        forget_user(user.user_id)
         
         new_role = "admin" if user.role == 'admin' else "passenger"
         flash(f'User role changed to {new_role} successfully!', 'success')
@@ -495,21 +781,8 @@ def user_details(user_id):
     user = User.query.get_or_404(user_id)
     
     # Get user's booking history
-    reservations = Reservation.query.filter_by(user_id=user_id).order_by(Reservation.reservation_date.desc()).all()
-    
-    booking_details = []
-    for reservation in reservations:
-        reservation_seats = ReservationSeat.query.filter_by(reservation_id=reservation.reservation_id).all()
-        for reservation_seat in reservation_seats:
-            passenger = Passenger.query.get(reservation_seat.passenger_id)
-            seat = Seat.query.get(reservation_seat.seat_id)
-            flight = Flight.query.get(reservation_seat.flight_id)
-            booking_details.append({
-                'reservation': reservation,
-                'flight': flight,
-                'passenger': passenger,
-                'seat': seat
-            })
-
-    
-    return render_template('admin/user_details.html', user=user, booking_details=booking_details)
+    pagination, booking_details = booking_history(user_id, page=request.args.get('page', 1, type=int))
+    total_bookings, total_spent = booking_totals(user_id)
+    
+    return render_template('admin/user_details.html', user=user, booking_details=booking_details,
+                           pagination=pagination, total_bookings=total_bookings, total_spent=total_spent)
@@ -1,8 +1,9 @@
 from flask import Blueprint, render_template, redirect, url_for, request, flash
-from flask_login import login_user, logout_user, login_required
+from flask_login import login_user, logout_user, login_required, current_user
 from app.forms import LoginForm, RegistrationForm
 from app.models import User
 from app import db
+from app.utils.user_cache import forget_user
 
 bp = Blueprint('auth', __name__, url_prefix='/auth')
 
@@ -21,7 +22,9 @@ def login():
         elif not user.check_password(form.password.data):
             flash('Incorrect password. Please try again.', 'danger')
         else:
+            forget_user(user.user_id)
             login_user(user)
+            db.session.commit()  # persists a rehashed password
             flash('Logged in successfully!', 'success')
             
             # Redirect based on user role
@@ -35,6 +38,7 @@ def login():
 @bp.route('/logout')
 @login_required
 def logout():
+    forget_user(current_user.user_id)
     logout_user()
     return redirect(url_for('auth.login'))
 
@@ -0,0 +1,25 @@
+from flask import Blueprint, request, jsonify
+from flask_login import login_required
+from app.utils.auth_helper import role_required
+from app.utils.ticket_token import verify_ticket_token
+
+bp = Blueprint('checkin', __name__, url_prefix='/checkin')
+
+# Gate scanners post the token read from the ticket QR code. Everything
+# needed to answer is inside the signed token, so no booking lookup is made.
+@bp.route('/verify', methods=['GET', 'POST'])
+@login_required
+@role_required('admin')
+def verify_ticket():
+    data = request.get_json(silent=True) or request.values
+    token = (data.get('token') or '').strip()
+    if not token:
+        return jsonify({'valid': False, 'error': 'Missing ticket token'}), 400
+
+    ticket, error = verify_ticket_token(token)
+    if ticket is None:
+        return jsonify({'valid': False, 'error': error}), 400
+    if error:
+        return jsonify({'valid': False, 'error': error, 'ticket': ticket}), 410
+
+    return jsonify({'valid': True, 'ticket': ticket})
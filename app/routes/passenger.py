@@ -8,14 +8,19 @@ from app.models import (
     Price, Seat, Reservation, ReservationSeat, Invoice, Discount,
     SeatClass, SeatPosition, ReservationStatus, TripType, FlightType
 )
-from sqlalchemy.orm import aliased
+from sqlalchemy.orm import aliased, joinedload, selectinload
 from app import db
 from datetime import datetime, timedelta
 from sqlalchemy import and_, or_, func, cast, Date, text
 import json
 from werkzeug.datastructures import MultiDict
 
+from app.utils.booking_history import booking_history
+from app.utils.db_routing import read_replica
 from app.utils.pdf_generator import generate_invoice_pdf, generate_ticket_pdf
+from app.utils.revenue_rollup import record_booking, record_refund
+from app.utils.ticket_data import load_reservation_documents
+from app.utils.ticket_token import make_ticket_token, revoke_ticket
 
 bp = Blueprint('passenger', __name__, url_prefix='/passenger')
 
@@ -24,21 +29,33 @@ bp = Blueprint('passenger', __name__, url_prefix='/passenger')
 @login_required
 @role_required('passenger')
 def passenger_dashboard():
-    # Get user's recent reservations
-    recent_reservations = Reservation.query.filter_by(user_id=current_user.user_id).order_by(Reservation.reservation_date.desc()).limit(5).all()
+    # Get user's recent reservations, with the first flight of each for the table
+    recent_reservations = Reservation.query.filter_by(user_id=current_user.user_id).options(
+        selectinload(Reservation.reservation_seats).joinedload(ReservationSeat.flight)
+        .joinedload(Flight.flight_template).options(
+            joinedload(FlightTemplate.departure_airport),
+            joinedload(FlightTemplate.arrival_airport)
+        )
+    ).order_by(Reservation.reservation_date.desc()).limit(5).all()
     
-    # Get upcoming flights
-    upcoming_flights = []
-    for reservation in recent_reservations:
-        if reservation.status == ReservationStatus.Confirmed:
-            for reservation_seat in reservation.reservation_seats:
-                if reservation_seat.flight.departure_datetime > datetime.utcnow():
-                    upcoming_flights.append({
-                        'reservation': reservation,
-                        'flight': reservation_seat.flight,
-                        'passenger' :Passenger.query.get(reservation_seat.passenger_id)
-
-                    })
+    # Get upcoming flights: every confirmed booking still to depart, not just recent ones
+    upcoming = db.session.query(Reservation, Flight).join(
+        ReservationSeat, ReservationSeat.reservation_id == Reservation.reservation_id
+    ).join(
+        Flight, ReservationSeat.flight_id == Flight.flight_id
+    ).filter(
+        Reservation.user_id == current_user.user_id,
+        Reservation.status == ReservationStatus.Confirmed,
+        Flight.departure_datetime > datetime.utcnow()
+    ).options(
+        joinedload(Flight.flight_template).options(
+            joinedload(FlightTemplate.airline),
+            joinedload(FlightTemplate.departure_airport),
+            joinedload(FlightTemplate.arrival_airport)
+        )
+    ).distinct().order_by(Flight.departure_datetime, Reservation.reservation_id).all()
+
+    upcoming_flights = [{'reservation': reservation, 'flight': flight} for reservation, flight in upcoming]
     
     return render_template('passenger/dashboard.html', 
                          user=current_user, 
@@ -227,6 +244,7 @@ def search_flights():
 @bp.route('/get-cities/<country>')
 @login_required
 @role_required('passenger')
+@read_replica
 def get_cities(country):
     cities = db.session.query(Airport.city).filter(Airport.country == country).distinct().all()
     return jsonify([city[0] for city in cities])
@@ -235,15 +253,30 @@ def get_cities(country):
 @bp.route('/get-airports/<city>')
 @login_required
 @role_required('passenger')
+@read_replica
 def get_airports(city):
     airports = Airport.query.filter(Airport.city == city).all()
     return jsonify([{'id': a.airport_id, 'name': f"{a.name} ({a.IATA_code})"} for a in airports])
 
 
 
+def _with_result_details(query):
+    # Everything search_results.html reads for each flight, loaded up front
+    return query.options(
+        selectinload(Flight.flight_template).options(
+            joinedload(FlightTemplate.airline),
+            joinedload(FlightTemplate.departure_airport),
+            joinedload(FlightTemplate.arrival_airport),
+            joinedload(FlightTemplate.prices),
+        ),
+        selectinload(Flight.discounts),
+    )
+
+
 @bp.route('/search/results', methods=['GET', 'POST'])
 @login_required
 @role_required('passenger')
+@read_replica
 def search_results():
     search_data = session.get('search_data')
     if not search_data:
@@ -345,7 +378,7 @@ def search_results():
     else:  # default departure_time
         query = query.order_by(Flight.departure_datetime.asc())
 
-    flights = query.all()
+    flights = _with_result_details(query).all()
 
     # Return flights (round-trip)
     return_flights = []
@@ -406,7 +439,7 @@ def search_results():
             else:
                 return_query = return_query.order_by(Flight.departure_datetime.asc())
 
-            return_flights = return_query.all()
+            return_flights = _with_result_details(return_query).all()
         except ValueError:
             pass
 
@@ -455,7 +488,7 @@ def book_flight(flight_id):
             passenger_forms.append(form)
             if not form.validate():
                 valid = False
-                print(f"Form {i} errors: {form.errors}") 
+                current_app.logger.info("Passenger form %s errors: %s", i, form.errors)
 
         
         if valid:
@@ -524,8 +557,13 @@ def select_seats():
         )
     ).all()
     
-    # Filter out already booked seats
-    booked_seat_ids = [rs.seat_id for rs in flight.reservations_seats]
+    # Filter out seats held by confirmed bookings; refunded and cancelled ones are free again
+    booked_seat_ids = {seat_id for (seat_id,) in db.session.query(ReservationSeat.seat_id).join(
+        Reservation, ReservationSeat.reservation_id == Reservation.reservation_id
+    ).filter(
+        ReservationSeat.flight_id == flight.flight_id,
+        Reservation.status == ReservationStatus.Confirmed
+    )}
     available_seats = [seat for seat in available_seats if seat.seat_id not in booked_seat_ids]
     
     if request.method == 'POST':
@@ -611,16 +649,17 @@ def payment():
                 amount=session_data['total_price']
             )
             db.session.add(invoice)
+            record_booking(flight, SeatClass(session_data['search_data']['seat_class']), session_data['total_price'])
             
             db.session.commit()
             
             flash('Booking confirmed! Your ticket has been generated.', 'success')
             return redirect(url_for('passenger.view_ticket', reservation_id=reservation.reservation_id))
             
-        except Exception as e:
+        except Exception:
             db.session.rollback()
             flash('An error occurred during booking. Please try again.', 'danger')
-            print(f"Booking error: {e}") 
+            current_app.logger.exception("Booking failed for user %s", current_user.user_id)
     
     return render_template('passenger/payment.html', 
                          form=form, 
@@ -632,7 +671,16 @@ def payment():
 @role_required('passenger')
 def view_ticket(reservation_id):
     reservation = Reservation.query.get_or_404(reservation_id)
-    reservation_seats = ReservationSeat.query.filter_by(reservation_id=reservation_id).all()
+    reservation_seats = ReservationSeat.query.filter_by(reservation_id=reservation_id).options(
+        joinedload(ReservationSeat.passenger),
+        joinedload(ReservationSeat.seat),
+        joinedload(ReservationSeat.flight).joinedload(Flight.flight_template).options(
+            joinedload(FlightTemplate.airline),
+            joinedload(FlightTemplate.aircraft),
+            joinedload(FlightTemplate.departure_airport),
+            joinedload(FlightTemplate.arrival_airport),
+        )
+    ).all()
     if not reservation_seats:
         flash('No seats found for this reservation.', 'danger')
         return redirect(url_for('passenger.dashboard'))
@@ -641,10 +689,8 @@ def view_ticket(reservation_id):
     flight = None
 
     for rs in reservation_seats:
-        flight = Flight.query.get_or_404(rs.flight_id)
-        passenger = Passenger.query.get_or_404(rs.passenger_id)
-        seat = Seat.query.get_or_404(rs.seat_id)
-        passenger_seat_pairs.append({"passenger": passenger, "seat": seat})
+        flight = rs.flight
+        passenger_seat_pairs.append({"passenger": rs.passenger, "seat": rs.seat})
 
     flights_info = [{
         "passenger_seat_pairs": passenger_seat_pairs,
@@ -663,23 +709,14 @@ def view_ticket(reservation_id):
 @login_required
 @role_required('passenger')
 def download_ticket(reservation_id):
-    reservation = Reservation.query.get_or_404(reservation_id)
-    reservation_seats = ReservationSeat.query.filter_by(reservation_id=reservation_id).all()
-    if not reservation_seats:
+    documents = load_reservation_documents(reservation_id)
+    if documents is None:
         flash('No seats found for this reservation.', 'danger')
         return redirect(url_for('passenger.dashboard'))
 
-    passenger_seat_pairs = []
-    flight = None
-
-    for rs in reservation_seats:
-        flight = Flight.query.get_or_404(rs.flight_id)
-        passenger = Passenger.query.get_or_404(rs.passenger_id)
-        seat = Seat.query.get_or_404(rs.seat_id)
-        passenger_seat_pairs.append({"passenger": passenger, "seat": seat})
-
-        # Generate PDF bytes
-    pdf_bytes = generate_ticket_pdf(reservation, passenger_seat_pairs, flight)
+    reservation, flight, passengers = documents
+    qr_payload = make_ticket_token(reservation.reservation_id, flight, passengers)
+    pdf_bytes = generate_ticket_pdf(reservation, passengers, flight, qr_payload)
 
     # Send PDF as downloadable file
     return send_file(
@@ -696,26 +733,17 @@ def download_ticket(reservation_id):
 @login_required
 @role_required('passenger')
 def download_invoice(reservation_id):
-    reservation = Reservation.query.get_or_404(reservation_id)
+    documents = load_reservation_documents(reservation_id)
+    if documents is None:
+        flash('No seats found for this reservation.', 'danger')
+        return redirect(url_for('passenger.dashboard'))
 
+    reservation, flight, passengers = documents
     if reservation.user_id != current_user.user_id:
         flash('Access denied.', 'danger')
         return redirect(url_for('passenger.dashboard'))
 
-    reservation_seats = ReservationSeat.query.filter_by(reservation_id=reservation_id).all()
-    if not reservation_seats:
-        flash('No seats found for this reservation.', 'danger')
-        return redirect(url_for('passenger.dashboard'))
-
-    flight = Flight.query.get(reservation_seats[0].flight_id)
-    user = reservation.user  # directly from reservation relationship
-
-    user_info = {
-        'name': user.name,
-        'email': user.email
-    }
-
-    pdf_bytes = generate_invoice_pdf(reservation, reservation_seats, flight, user_info)
+    pdf_bytes = generate_invoice_pdf(reservation, passengers, flight)
 
     return send_file(
         io.BytesIO(pdf_bytes),
@@ -730,26 +758,10 @@ def download_invoice(reservation_id):
 @login_required
 @role_required('passenger')
 def view_bookings():
-    reservations = Reservation.query.filter_by(user_id=current_user.user_id).order_by(Reservation.reservation_date.desc()).all()
-    
-    booking_details = []
-    for reservation in reservations:
-        reservation_seats = ReservationSeat.query.filter_by(reservation_id=reservation.reservation_id).all()
-        for reservation_seat in reservation_seats:
-            # Manually query the related passenger and seat
-            passenger = Passenger.query.get(reservation_seat.passenger_id)
-            seat = Seat.query.get(reservation_seat.seat_id)
-
-            booking_details.append({
-                'reservation': reservation,
-                'flight': Flight.query.get(reservation_seat.flight_id),
-                'passenger': passenger,
-                'seat': seat,
-                'can_refund': reservation.status == ReservationStatus.Confirmed and 
-                             Flight.query.get(reservation_seat.flight_id).departure_datetime > datetime.utcnow()
-            })
+    pagination, booking_details = booking_history(current_user.user_id,
+                                                  page=request.args.get('page', 1, type=int))
     
-    return render_template('passenger/bookings.html', booking_details=booking_details)
+    return render_template('passenger/bookings.html', booking_details=booking_details, pagination=pagination)
 
 
 # Refund route
@@ -783,8 +795,10 @@ def refund_booking(reservation_id):
         # Update invoice amount to reflect refund
         if reservation.invoice:
             reservation.invoice.amount = refund_amount
+        record_refund(reservation, refund_amount)
         
         db.session.commit()
+        revoke_ticket(reservation_id)
         
         flash(f'Refund processed successfully. Refund amount: ${refund_amount:.2f}', 'success')
         
@@ -0,0 +1,123 @@
+# utils/admin_lookup.py
+from sqlalchemy import or_
+from sqlalchemy.orm import aliased
+from app import db
+from app.models import Airport, Flight, FlightTemplate
+
+# Backing queries for the admin pickers. Each page is one indexed query that
+# returns plain (id, label) pairs, and a submitted id is checked by loading
+# that single row, so forms never have to load every flight or template.
+#
+# Terms match as prefixes with a plain LIKE 'term%' so the indexes on
+# flight_number, IATA_code and airports.name apply; wrapping the column in
+# LOWER() would rule them out. Codes and flight numbers are stored upper-case,
+# so the term is upper-cased for those.
+
+LOOKUP_PAGE_SIZE = 20
+
+
+def _flight_rows():
+    dep = aliased(Airport)
+    arr = aliased(Airport)
+    query = db.session.query(
+        Flight.flight_id, Flight.departure_datetime, FlightTemplate.flight_number,
+        dep.IATA_code, arr.IATA_code
+    ).join(
+        FlightTemplate, Flight.flight_template_id == FlightTemplate.flight_template_id
+    ).join(
+        dep, FlightTemplate.departure_airport_id == dep.airport_id
+    ).join(
+        arr, FlightTemplate.arrival_airport_id == arr.airport_id
+    ).filter(Flight.is_active == True)
+    return query, dep, arr
+
+
+def _flight_label(row):
+    flight_id, departure, flight_number, dep_code, arr_code = row
+    return f"{flight_number} {dep_code}-{arr_code} - {departure.strftime('%Y-%m-%d %H:%M')}"
+
+
+def search_flights(term='', after=None, limit=LOOKUP_PAGE_SIZE):
+    """A page of active flights in departure order, optionally matching a flight number or airport code.
+
+    after is the id of the last flight on the previous page. Returns
+    (results, next_after) where next_after is None on the last page.
+    """
+    query, dep, arr = _flight_rows()
+    term = term.strip().upper()
+    if term:
+        query = query.filter(or_(
+            FlightTemplate.flight_number.startswith(term, autoescape=True),
+            dep.IATA_code.startswith(term, autoescape=True),
+            arr.IATA_code.startswith(term, autoescape=True),
+        ))
+    if after:
+        last = db.session.query(Flight.departure_datetime).filter(Flight.flight_id == after).scalar()
+        if last is None:
+            # The cursor's flight is gone; don't silently restart from page one
+            return [], None
+        query = query.filter(or_(
+            Flight.departure_datetime > last,
+            (Flight.departure_datetime == last) & (Flight.flight_id > after)
+        ))
+
+    rows = query.order_by(Flight.departure_datetime, Flight.flight_id).limit(limit + 1).all()
+    next_after = rows[limit - 1][0] if len(rows) > limit else None
+    return [(row[0], _flight_label(row)) for row in rows[:limit]], next_after
+
+
+def flight_choice(flight_id):
+    """[(id, label)] for an active flight, or [] so the form rejects the id."""
+    if not flight_id:
+        return []
+    query, dep, arr = _flight_rows()
+    row = query.filter(Flight.flight_id == flight_id).first()
+    return [(row[0], _flight_label(row))] if row else []
+
+
+def _template_rows():
+    dep = aliased(Airport)
+    arr = aliased(Airport)
+    query = db.session.query(
+        FlightTemplate.flight_template_id, FlightTemplate.flight_number, dep.name, arr.name
+    ).join(
+        dep, FlightTemplate.departure_airport_id == dep.airport_id
+    ).join(
+        arr, FlightTemplate.arrival_airport_id == arr.airport_id
+    )
+    return query, dep, arr
+
+
+def _template_label(row):
+    template_id, flight_number, dep_name, arr_name = row
+    return f"{flight_number} - {dep_name} to {arr_name}"
+
+
+def search_templates(term='', after=None, limit=LOOKUP_PAGE_SIZE):
+    """A page of flight templates in id order, optionally matching a flight number or airport."""
+    query, dep, arr = _template_rows()
+    term = term.strip()
+    if term:
+        code = term.upper()
+        query = query.filter(or_(
+            FlightTemplate.flight_number.startswith(code, autoescape=True),
+            dep.IATA_code.startswith(code, autoescape=True),
+            arr.IATA_code.startswith(code, autoescape=True),
+            dep.name.startswith(term, autoescape=True),
+            arr.name.startswith(term, autoescape=True),
+        ))
+    if after:
+        query = query.filter(FlightTemplate.flight_template_id > after)
+
+    rows = query.order_by(FlightTemplate.flight_template_id).limit(limit + 1).all()
+    next_after = rows[limit - 1][0] if len(rows) > limit else None
+    return [(row[0], _template_label(row)) for row in rows[:limit]], next_after
+
+
+def template_choice(flight_template_id):
+    """[(id, label)] for a flight template, or [] so the form rejects the id."""
+    if not flight_template_id:
+        return []
+    query, dep, arr = _template_rows()
+    row = query.filter(FlightTemplate.flight_template_id == flight_template_id).first()
+    return [(row[0], _template_label(row))] if row else []
@@ -2,12 +2,17 @@ from flask import abort
 from flask_login import current_user
 from functools import wraps
 
+from app.utils.user_cache import current_role
+
 def role_required(role):
     def decorator(view_func):
         @wraps(view_func)
         def wrapped_view(*args, **kwargs):
             if not current_user.is_authenticated or current_user.role != role:
                 abort(403)
+            # The cached identity may predate a demotion made in another worker
+            if role == 'admin' and current_role(current_user.user_id) != role:
+                abort(403)
             return view_func(*args, **kwargs)
         return wrapped_view
     return decorator
@@ -0,0 +1,57 @@
+# utils/booking_history.py
+from datetime import datetime
+
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
+from app import db
+from app.models import Flight, FlightTemplate, Reservation, ReservationSeat, ReservationStatus
+
+# Booking history for one user, shared by the passenger bookings page and the
+# admin user details view. A page costs three queries whatever its size: the
+# count, the page of reservations, and one SELECT ... IN for their seats with
+# passenger, seat, flight, template, airline and airports joined in.
+
+BOOKINGS_PER_PAGE = 20
+
+
+def booking_history(user_id, page=1, per_page=BOOKINGS_PER_PAGE):
+    """Return (pagination, booking_details) for a user's reservations, newest first.
+
+    booking_details has one dict per reserved seat, with the reservation,
+    flight, passenger and seat, in the shape the booking templates expect.
+    """
+    seat_loads = selectinload(Reservation.reservation_seats)
+    flight_loads = seat_loads.joinedload(ReservationSeat.flight).joinedload(Flight.flight_template)
+
+    pagination = Reservation.query.filter_by(user_id=user_id).options(
+        seat_loads.joinedload(ReservationSeat.passenger),
+        seat_loads.joinedload(ReservationSeat.seat),
+        flight_loads.joinedload(FlightTemplate.airline),
+        flight_loads.joinedload(FlightTemplate.departure_airport),
+        flight_loads.joinedload(FlightTemplate.arrival_airport),
+    ).order_by(
+        Reservation.reservation_date.desc(), Reservation.reservation_id.desc()
+    ).paginate(page=page, per_page=per_page, error_out=False)
+
+    now = datetime.utcnow()
+    booking_details = []
+    for reservation in pagination.items:
+        for reservation_seat in reservation.reservation_seats:
+            booking_details.append({
+                'reservation': reservation,
+                'flight': reservation_seat.flight,
+                'passenger': reservation_seat.passenger,
+                'seat': reservation_seat.seat,
+                'can_refund': reservation.status == ReservationStatus.Confirmed and
+                              reservation_seat.flight.departure_datetime > now
+            })
+
+    return pagination, booking_details
+
+
+def booking_totals(user_id):
+    """(reservations, total spent) across all of a user's bookings."""
+    count, spent = db.session.query(
+        func.count(Reservation.reservation_id), func.sum(Reservation.total_price)
+    ).filter(Reservation.user_id == user_id).one()
+    return count or 0, spent or 0
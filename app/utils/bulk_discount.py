@@ -0,0 +1,74 @@
+# utils/bulk_discount.py
+from datetime import datetime, time, timedelta
+
+from sqlalchemy import and_, exists, insert, literal, or_, select, update
+from sqlalchemy.orm import aliased
+from app import db
+from app.models import Airport, Discount, Flight, FlightTemplate
+
+# A flight has at most one discount (discounts.flight_id is unique), so
+# applying a discount means overwriting the existing row or adding one.
+# Both happen as one UPDATE and one INSERT ... SELECT over the matching
+# flights, however many flights a flash sale covers.
+
+
+def route_choices():
+    """(value, label) pairs for every route that has a flight template."""
+    dep = aliased(Airport)
+    arr = aliased(Airport)
+    rows = db.session.query(
+        FlightTemplate.departure_airport_id, FlightTemplate.arrival_airport_id,
+        dep.IATA_code, arr.IATA_code
+    ).join(
+        dep, FlightTemplate.departure_airport_id == dep.airport_id
+    ).join(
+        arr, FlightTemplate.arrival_airport_id == arr.airport_id
+    ).distinct().order_by(dep.IATA_code, arr.IATA_code).all()
+    return [(f"{dep_id}-{arr_id}", f"{dep_code} → {arr_code}") for dep_id, arr_id, dep_code, arr_code in rows]
+
+
+def matching_flights(routes=None, airline_id=None, start_date=None, end_date=None):
+    """SELECT of the ids of active flights matching the bulk-discount filters.
+
+    routes are "<departure_airport_id>-<arrival_airport_id>" strings as
+    produced by route_choices().
+    """
+    query = select(Flight.flight_id).join(
+        FlightTemplate, Flight.flight_template_id == FlightTemplate.flight_template_id
+    ).where(Flight.is_active == True)
+
+    if routes:
+        pairs = [tuple(int(part) for part in route.split('-')) for route in routes]
+        query = query.where(or_(*[
+            and_(FlightTemplate.departure_airport_id == dep_id, FlightTemplate.arrival_airport_id == arr_id)
+            for dep_id, arr_id in pairs
+        ]))
+    if airline_id:
+        query = query.where(FlightTemplate.airline_id == airline_id)
+    if start_date:
+        query = query.where(Flight.departure_datetime >= datetime.combine(start_date, time.min))
+    if end_date:
+        query = query.where(Flight.departure_datetime < datetime.combine(end_date + timedelta(days=1), time.min))
+    return query
+
+
+def apply_discount(flights, percentage):
+    """Set the discount on every flight id selected by `flights`. The caller commits.
+
+    Returns (updated, inserted) row counts.
+    """
+    flight_ids = flights.scalar_subquery()
+
+    updated = db.session.execute(
+        update(Discount).where(Discount.flight_id.in_(flight_ids)).values(discount_percentage=percentage),
+        execution_options={'synchronize_session': False}
+    ).rowcount
+
+    missing = flights.add_columns(literal(percentage)).where(
+        ~exists().where(Discount.flight_id == Flight.flight_id)
+    )
+    inserted = db.session.execute(
+        insert(Discount).from_select(['flight_id', 'discount_percentage'], missing)
+    ).rowcount
+
+    return updated, inserted
@@ -5,6 +5,7 @@ from app.models import (
     Reservation, ReservationSeat, ReservationStatus, TripType,
     Invoice, Discount
 )
+from app.utils.revenue_rollup import rebuild_rollup
 from datetime import datetime, timedelta
 import random
 
@@ -257,6 +258,10 @@ def create_test_data():
 
         db.session.commit()
 
+        # --- Revenue rollup ---
+        rebuild_rollup()
+        print("✅ Revenue rollup rebuilt")
+
         print("\n🎉 Test data creation complete!")
 
 if __name__ == "__main__":
@@ -0,0 +1,157 @@
+# utils/csv_export.py
+import csv
+import io
+from datetime import datetime, time, timedelta
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import aliased
+from app import db
+from app.models import (
+    Airport, Flight, FlightTemplate, Invoice, Passenger, Reservation,
+    ReservationSeat, ReservationStatus, Seat, User
+)
+
+# CSV exports for finance and operations. Every export is a generator that
+# reads its query in keyset pages of EXPORT_BATCH_SIZE rows, so only one page
+# is held in memory at a time however large the date range is. (yield_per
+# would not do: mysqlconnector has no server-side cursors and buffers the
+# whole result.)
+#
+# Text cells that a spreadsheet would read as a formula are prefixed with a
+# quote, since names and emails are user-supplied.
+
+EXPORT_BATCH_SIZE = 1000
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+RESERVATION_COLUMNS = [
+    'reservation_id', 'reservation_date', 'user_id', 'user_name', 'user_email',
+    'status', 'trip_type', 'payment_method', 'total_price',
+]
+MANIFEST_COLUMNS = [
+    'reservation_id', 'first_name', 'last_name', 'gender', 'age', 'passport_no',
+    'contact_number', 'seat_number', 'seat_class', 'seat_position',
+]
+INVOICE_COLUMNS = [
+    'invoice_id', 'issued_date', 'reservation_id', 'user_email', 'flight_number',
+    'route', 'reservation_status', 'total_price', 'invoice_amount',
+]
+
+
+def _window(column, start, end):
+    criteria = []
+    if start:
+        criteria.append(column >= datetime.combine(start, time.min))
+    if end:
+        criteria.append(column < datetime.combine(end + timedelta(days=1), time.min))
+    return criteria
+
+
+def _keyset_pages(query, *keys):
+    """Yield the rows of query ordered by keys, one EXPORT_BATCH_SIZE page per round trip.
+
+    The key columns are selected alongside the row so each page can start
+    strictly after the last row of the one before.
+    """
+    query = query.add_columns(*keys).order_by(*keys)
+    last = None
+    while True:
+        page = query
+        if last is not None:
+            after = keys[0] > last[0] if len(keys) == 1 else tuple_(*keys) > tuple_(*last)
+            page = page.filter(after)
+        rows = page.limit(EXPORT_BATCH_SIZE).all()
+        for row in rows:
+            yield row[:-len(keys)]
+        if len(rows) < EXPORT_BATCH_SIZE:
+            return
+        last = rows[-1][-len(keys):]
+
+
+def _value(value):
+    if hasattr(value, 'value'):
+        return value.value
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def stream_csv(columns, rows):
+    """Yield a header line, then the rows as CSV text one batch at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+
+    for count, row in enumerate(rows, 1):
+        writer.writerow([_value(value) for value in row])
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def reservation_rows(start=None, end=None):
+    """Reservations made in [start, end], oldest first."""
+    query = db.session.query(
+        Reservation.reservation_id, Reservation.reservation_date, User.user_id, User.name, User.email,
+        Reservation.status, Reservation.trip_type, Reservation.payment_method, Reservation.total_price,
+    ).join(
+        User, Reservation.user_id == User.user_id
+    ).filter(
+        *_window(Reservation.reservation_date, start, end)
+    )
+    return _keyset_pages(query, Reservation.reservation_id)
+
+
+def manifest_rows(flight_id):
+    """Confirmed passengers on one flight, by seat."""
+    query = db.session.query(
+        ReservationSeat.reservation_id, Passenger.first_name, Passenger.last_name, Passenger.gender,
+        Passenger.age, Passenger.passport_no, Passenger.contact_number,
+        Seat.seat_number, Seat.class_, Seat.position,
+    ).join(
+        Reservation, ReservationSeat.reservation_id == Reservation.reservation_id
+    ).join(
+        Passenger, ReservationSeat.passenger_id == Passenger.passenger_id
+    ).join(
+        Seat, ReservationSeat.seat_id == Seat.seat_id
+    ).filter(
+        ReservationSeat.flight_id == flight_id,
+        Reservation.status == ReservationStatus.Confirmed
+    )
+    return _keyset_pages(query, Seat.seat_number, ReservationSeat.reservation_id, ReservationSeat.passenger_id)
+
+
+def invoice_rows(start=None, end=None):
+    """Invoice ledger for invoices issued in [start, end], with each booking's first flight."""
+    first_flight = db.session.query(
+        ReservationSeat.reservation_id,
+        db.func.min(ReservationSeat.flight_id).label('flight_id'),
+    ).group_by(ReservationSeat.reservation_id).subquery()
+    dep = aliased(Airport)
+    arr = aliased(Airport)
+
+    query = db.session.query(
+        Invoice.invoice_id, Invoice.issued_date, Reservation.reservation_id, User.email,
+        FlightTemplate.flight_number, dep.IATA_code + '-' + arr.IATA_code,
+        Reservation.status, Reservation.total_price, Invoice.amount,
+    ).join(
+        Reservation, Invoice.reservation_id == Reservation.reservation_id
+    ).join(
+        User, Reservation.user_id == User.user_id
+    ).outerjoin(
+        first_flight, first_flight.c.reservation_id == Reservation.reservation_id
+    ).outerjoin(
+        Flight, Flight.flight_id == first_flight.c.flight_id
+    ).outerjoin(
+        FlightTemplate, Flight.flight_template_id == FlightTemplate.flight_template_id
+    ).outerjoin(
+        dep, FlightTemplate.departure_airport_id == dep.airport_id
+    ).outerjoin(
+        arr, FlightTemplate.arrival_airport_id == arr.airport_id
+    ).filter(
+        *_window(Invoice.issued_date, start, end)
+    )
+    return _keyset_pages(query, Invoice.invoice_id)
@@ -0,0 +1,114 @@
+# utils/db_pool.py
+from threading import Lock, local
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+# Engine pool setup and instrumentation. TimedQueuePool is a QueuePool that
+# records how long each checkout waited for a connection, which together
+# with the pool's own size/overflow counters is what /admin/pool-stats
+# reports.
+
+
+class PoolWaitStats:
+    def __init__(self):
+        self._lock = Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait, timed_out=False):
+        with self._lock:
+            self.checkouts += 1
+            self.timeouts += timed_out
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'wait_total_ms': round(self.total_wait * 1000, 3),
+                'wait_avg_ms': round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                'wait_max_ms': round(self.max_wait * 1000, 3),
+            }
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that times every checkout, including waits for a free connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+        self._nested = local()
+
+    def _do_get(self):
+        # QueuePool._do_get retries by calling itself; only time the outer call
+        if getattr(self._nested, 'active', False):
+            return super()._do_get()
+
+        self._nested.active = True
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            self._nested.active = False
+            self.wait_stats.record(time.perf_counter() - start, timed_out)
+
+
+def engine_options(uri, options):
+    """Engine options to use for uri: the configured pool with TimedQueuePool.
+
+    In-memory SQLite runs on a single static connection, so pool sizing does
+    not apply and Flask-SQLAlchemy's own defaults are kept.
+    """
+    if uri.startswith('sqlite') and (uri in ('sqlite://', 'sqlite:///') or ':memory:' in uri):
+        return {}
+    return dict(options, poolclass=TimedQueuePool)
+
+
+def set_statement_timeout(engine, timeout_ms):
+    """Cap statement run time on every new connection (MySQL: SELECTs only)."""
+    if not timeout_ms:
+        return
+    if engine.dialect.name == 'mysql':
+        statement = f"SET SESSION max_execution_time = {int(timeout_ms)}"
+    elif engine.dialect.name == 'postgresql':
+        statement = f"SET statement_timeout = {int(timeout_ms)}"
+    else:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def apply_timeout(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(statement)
+        cursor.close()
+
+
+def pool_stats(engine, max_overflow=None):
+    """Pool counters from QueuePool's public accessors.
+
+    The pool does not expose its overflow cap, so the caller passes the
+    configured max_overflow through.
+    """
+    pool = engine.pool
+    stats = {'pool': type(pool).__name__, 'status': pool.status()}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            'size': pool.size(),
+            'checked_in': pool.checkedin(),
+            'checked_out': pool.checkedout(),
+            'overflow': pool.overflow(),
+            'max_overflow': max_overflow,
+            'timeout_s': pool.timeout(),
+        })
+    if isinstance(pool, TimedQueuePool):
+        stats.update(pool.wait_stats.as_dict())
+    return stats
@@ -0,0 +1,69 @@
+# utils/db_routing.py
+from functools import wraps
+import time
+
+from flask import current_app, g, has_request_context, session as http_session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.sql.expression import UpdateBase
+
+# Read-only views marked with @read_replica send their queries to the
+# "replica" bind when SQLALCHEMY_BINDS configures one. Everything else, and
+# anything that writes, uses the primary. After a request commits a write,
+# the browser session stays on the primary for REPLICA_STICKY_SECONDS so a
+# user who has just booked sees their booking despite replication lag.
+
+REPLICA_BIND = 'replica'
+STICKY_KEY = 'db_primary_until'
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and not self._flushing
+            and not isinstance(clause, UpdateBase)
+            and has_request_context()
+            and g.get('db_replica')
+            and REPLICA_BIND in self._db.engines
+        ):
+            return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _flushed(session, flush_context):
+    _mark_write(session)
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _executed(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _mark_write(orm_execute_state.session)
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _committed(session):
+    if session.info.pop('wrote', False) and has_request_context():
+        http_session[STICKY_KEY] = time.time() + current_app.config['REPLICA_STICKY_SECONDS']
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _rolled_back(session):
+    session.info.pop('wrote', None)
+
+
+def _mark_write(session):
+    session.info['wrote'] = True
+    if has_request_context():
+        # Reads later in the same request must see the write
+        g.db_replica = False
+
+
+def read_replica(view_func):
+    """Run the view's queries on the replica unless this user has just written."""
+    @wraps(view_func)
+    def wrapped_view(*args, **kwargs):
+        g.db_replica = http_session.get(STICKY_KEY, 0) < time.time()
+        return view_func(*args, **kwargs)
+    return wrapped_view
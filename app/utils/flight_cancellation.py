@@ -0,0 +1,89 @@
+# utils/flight_cancellation.py
+from datetime import datetime
+
+from sqlalchemy import insert, literal, select, update
+from app import db
+from app.models import Flight, Invoice, Notification, Reservation, ReservationSeat, ReservationStatus
+from app.utils.revenue_rollup import record_bulk_refunds
+
+# Cancelling flights touches every confirmed booking on them, so it is done
+# as a handful of set-based statements rather than per reservation:
+#
+#   1. refunds are added to the revenue rollup, summed per rollup row
+#   2. one notification per affected booking and flight goes to the outbox
+#   3. invoices are set to the full refund, as refund_booking records refunds
+#   4. reservations move to Cancelled, which frees their seats
+#   5. the flights are deactivated
+#
+# Steps 1-3 select on status == Confirmed, so they run before step 4. Only
+# active flights that have not departed yet can be cancelled; passengers who
+# already flew keep their bookings.
+
+FLIGHT_CANCELLED = 'flight_cancelled'
+
+
+def cancel_flights(flight_ids):
+    """Cancel flights and fully refund their confirmed bookings. The caller commits.
+
+    Departed or already inactive flights in flight_ids are skipped. A
+    round-trip booking is cancelled as a whole if either of its flights is.
+    Returns the ids of the flights cancelled and the number of reservations
+    cancelled.
+    """
+    flight_ids = db.session.scalars(
+        select(Flight.flight_id).where(
+            Flight.flight_id.in_(flight_ids),
+            Flight.is_active.is_(True),
+            Flight.departure_datetime > datetime.utcnow()
+        )
+    ).all()
+    if not flight_ids:
+        return [], 0
+
+    booked = select(ReservationSeat.reservation_id).where(ReservationSeat.flight_id.in_(flight_ids))
+    confirmed = select(Reservation.reservation_id).where(
+        Reservation.status == ReservationStatus.Confirmed,
+        Reservation.reservation_id.in_(booked)
+    )
+
+    record_bulk_refunds(Reservation.status == ReservationStatus.Confirmed,
+                        Reservation.reservation_id.in_(booked))
+
+    db.session.execute(
+        insert(Notification).from_select(
+            ['user_id', 'reservation_id', 'flight_id', 'kind', 'created_at'],
+            select(
+                Reservation.user_id, Reservation.reservation_id, ReservationSeat.flight_id,
+                literal(FLIGHT_CANCELLED), literal(datetime.utcnow())
+            ).join(
+                ReservationSeat, ReservationSeat.reservation_id == Reservation.reservation_id
+            ).where(
+                Reservation.status == ReservationStatus.Confirmed,
+                ReservationSeat.flight_id.in_(flight_ids)
+            ).distinct()
+        )
+    )
+
+    db.session.execute(
+        update(Invoice).where(Invoice.reservation_id.in_(confirmed)).values(
+            amount=select(Reservation.total_price).where(
+                Reservation.reservation_id == Invoice.reservation_id
+            ).scalar_subquery()
+        ),
+        execution_options={'synchronize_session': False}
+    )
+
+    cancelled = db.session.execute(
+        update(Reservation).where(
+            Reservation.status == ReservationStatus.Confirmed,
+            Reservation.reservation_id.in_(booked)
+        ).values(status=ReservationStatus.Cancelled),
+        execution_options={'synchronize_session': False}
+    ).rowcount
+
+    db.session.execute(
+        update(Flight).where(Flight.flight_id.in_(flight_ids)).values(is_active=False),
+        execution_options={'synchronize_session': False}
+    )
+
+    return flight_ids, cancelled
@@ -0,0 +1,61 @@
+# utils/flight_schedule.py
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from app import db
+from app.models import Flight
+
+# Upper bound on one schedule run, so a mistyped date range can't insert
+# years of flights in one go. A daily flight for a full year fits.
+MAX_SCHEDULE_DAYS = 366
+
+
+def schedule_departures(start_date, end_date, weekdays, departure_time):
+    """Departure datetimes on the given weekdays (0 = Monday) in [start_date, end_date]."""
+    weekdays = set(weekdays)
+    departures = []
+    day = start_date
+    while day <= end_date:
+        if day.weekday() in weekdays:
+            departures.append(datetime.combine(day, departure_time))
+        day += timedelta(days=1)
+    return departures
+
+
+def find_clashes(flight_template_id, departures):
+    """Departures that already have a flight for this template.
+
+    Reads the template's flights inside the schedule's window with one range
+    scan on ix_flights_template_departure, rather than one lookup per date.
+    """
+    if not departures:
+        return set()
+    rows = db.session.query(Flight.departure_datetime).filter(
+        Flight.flight_template_id == flight_template_id,
+        Flight.departure_datetime >= min(departures),
+        Flight.departure_datetime <= max(departures)
+    ).all()
+    return set(departures) & {row[0] for row in rows}
+
+
+def create_scheduled_flights(flight_template, departures, timezone_diff):
+    """Insert one active flight per departure in a single statement. The caller commits.
+
+    Arrival is departure plus the template's duration. Seats belong to the
+    aircraft and availability is derived from reservation_seats, so a new
+    flight needs no per-flight inventory rows.
+    """
+    duration = timedelta(hours=flight_template.duration.hour, minutes=flight_template.duration.minute)
+    rows = [
+        {
+            'flight_template_id': flight_template.flight_template_id,
+            'departure_datetime': departure,
+            'arrival_datetime': departure + duration,
+            'timezone_diff': timezone_diff,
+            'is_active': True,
+        }
+        for departure in departures
+    ]
+    if rows:
+        db.session.execute(insert(Flight), rows)
+    return len(rows)
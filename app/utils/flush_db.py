@@ -21,11 +21,15 @@ from app.models import (
     ReservationSeat,
     Invoice,
     Discount,
+    DailyRevenue,
+    Notification,
 )
 
 app = create_app()  # create the Flask app instance
 
 def delete_all_data():
+    db.session.query(DailyRevenue).delete()
+    db.session.query(Notification).delete()
     db.session.query(ReservationSeat).delete()
     db.session.query(Invoice).delete()
     db.session.query(Discount).delete()
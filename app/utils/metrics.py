@@ -0,0 +1,211 @@
+# utils/metrics.py
+from bisect import bisect_left
+import hmac
+from threading import Lock
+import time
+
+from flask import Response, abort, g, has_request_context, request, template_rendered, before_render_template
+from flask_login import current_user
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Per-request timings and SQL counts, exposed at /metrics in the Prometheus
+# text format. Each request collects its numbers in g.request_metrics; they
+# are added to the histograms when the response is closed, so streamed
+# responses (CSV exports) include the time spent streaming. Metrics live in
+# process memory, so under gunicorn each worker reports its own.
+#
+# /metrics needs METRICS_TOKEN as a bearer token, or an admin session when
+# no token is configured.
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000)
+
+LABELS = ('endpoint', 'method')
+
+
+def _label_text(names, values):
+    pairs = ','.join(f'{name}="{value}"' for name, value in zip(names, values))
+    return '{' + pairs + '}' if pairs else ''
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    def __init__(self, name, documentation, buckets, labels=LABELS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self.labels = labels
+        self._series = {}
+        self._lock = Lock()
+
+    def observe(self, label_values, value):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                # one count per bucket plus +Inf, then the sum
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0]
+            series[bisect_left(self.buckets, value)] += 1
+            series[-1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+        for label_values, values in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), values):
+                cumulative += count
+                labels = _label_text(self.labels + ('le',), label_values + (bound,))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _label_text(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {_number(values[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name, documentation, labels):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values = {}
+        self._lock = Lock()
+
+    def inc(self, label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = dict(self._values)
+        for label_values, value in sorted(values.items()):
+            lines.append(f"{self.name}_total{_label_text(self.labels, label_values)} {value}")
+        return lines
+
+
+REQUESTS = Counter('skylink_requests', "Requests handled", LABELS + ('status',))
+REQUEST_SECONDS = Histogram('skylink_request_duration_seconds', "Wall time per request", DURATION_BUCKETS)
+DB_SECONDS = Histogram('skylink_request_db_seconds', "Time spent executing SQL per request", DURATION_BUCKETS)
+QUERIES = Histogram('skylink_request_queries', "SQL statements executed per request", COUNT_BUCKETS)
+ROWS = Histogram('skylink_request_rows', "Rows fetched through the ORM session per request", COUNT_BUCKETS)
+TEMPLATE_SECONDS = Histogram('skylink_request_template_seconds', "Template render time per request", DURATION_BUCKETS)
+
+METRICS = (REQUESTS, REQUEST_SECONDS, DB_SECONDS, QUERIES, ROWS, TEMPLATE_SECONDS)
+
+
+def _current():
+    return g.get('request_metrics') if has_request_context() else None
+
+
+# The start time lives on the execution context, which is discarded with
+# the statement, so a statement that fails leaves nothing behind.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    metrics = _current()
+    if metrics is not None:
+        elapsed = time.perf_counter() - context._metrics_start
+        metrics['queries'] += 1
+        metrics['db_time'] += elapsed
+
+
+def _count_rows(orm_execute_state):
+    """Buffer a SELECT's result to count its rows, then hand back a copy.
+
+    This holds every result in memory an extra time, so it only runs with
+    METRICS_COUNT_ROWS. Streamed queries (yield_per / stream_results) are
+    left alone so exports keep their constant memory; their rows are not
+    counted.
+    """
+    metrics = _current()
+    if metrics is None or metrics['rows'] is None or not orm_execute_state.is_select:
+        return None
+    options = orm_execute_state.execution_options
+    if options.get('yield_per') or options.get('stream_results'):
+        return None
+    frozen = orm_execute_state.invoke_statement().freeze()
+    metrics['rows'] += len(frozen.data)
+    return frozen()
+
+
+def _before_render(sender, template, context, **extra):
+    metrics = _current()
+    if metrics is not None:
+        metrics['template_start'].append(time.perf_counter())
+
+
+def _rendered(sender, template, context, **extra):
+    metrics = _current()
+    if metrics is not None and metrics['template_start']:
+        metrics['template_time'] += time.perf_counter() - metrics['template_start'].pop()
+
+
+def _record(metrics, label_values, status):
+    REQUESTS.inc(label_values + (str(status),))
+    REQUEST_SECONDS.observe(label_values, time.perf_counter() - metrics['start'])
+    DB_SECONDS.observe(label_values, metrics['db_time'])
+    QUERIES.observe(label_values, metrics['queries'])
+    if metrics['rows'] is not None:
+        ROWS.observe(label_values, metrics['rows'])
+    TEMPLATE_SECONDS.observe(label_values, metrics['template_time'])
+
+
+def render_metrics():
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+def init_metrics(app, session_class):
+    """Register the request hooks and the /metrics endpoint."""
+    if not app.config.get('METRICS_ENABLED'):
+        return
+
+    if not event.contains(Engine, 'after_cursor_execute', _after_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+    count_rows = app.config.get('METRICS_COUNT_ROWS', False)
+    if count_rows and not event.contains(session_class, 'do_orm_execute', _count_rows):
+        event.listen(session_class, 'do_orm_execute', _count_rows)
+    before_render_template.connect(_before_render, app)
+    template_rendered.connect(_rendered, app)
+
+    @app.before_request
+    def start_request_metrics():
+        if request.endpoint in ('metrics', 'static'):
+            return None
+        g.request_metrics = {
+            'start': time.perf_counter(),
+            'db_time': 0.0,
+            'queries': 0,
+            'rows': 0 if count_rows else None,
+            'template_time': 0.0,
+            'template_start': [],
+        }
+        return None
+
+    @app.after_request
+    def record_request_metrics(response):
+        metrics = g.get('request_metrics')
+        if metrics is not None:
+            label_values = (request.endpoint or 'unmatched', request.method)
+            response.call_on_close(lambda: _record(metrics, label_values, response.status_code))
+        return response
+
+    @app.route('/metrics')
+    def metrics():
+        token = app.config.get('METRICS_TOKEN')
+        if token:
+            if not hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {token}"):
+                abort(401)
+        elif not (current_user.is_authenticated and current_user.role == 'admin'):
+            abort(403)
+        return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
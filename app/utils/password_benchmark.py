@@ -0,0 +1,57 @@
+import sys
+import os
+import argparse
+import time
+
+# Add project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from app.utils.password_hashing import hash_method
+
+DEFAULT_SETTINGS = [
+    "pbkdf2:sha256:260000",
+    "pbkdf2:sha256:600000",
+    "pbkdf2:sha256:1000000",
+    "scrypt:16384:8:1",
+    "scrypt:32768:8:1",
+    "scrypt:65536:8:1",
+]
+
+
+def benchmark(method, iterations):
+    stored = generate_password_hash("correct horse battery staple", method=method)
+    check_password_hash(stored, "correct horse battery staple")  # warm up
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        check_password_hash(stored, "correct horse battery staple")
+    elapsed = time.perf_counter() - start
+
+    print(f"{method:<24} {iterations / elapsed:>10.1f} logins/s/core {elapsed / iterations * 1000:>8.2f} ms/login")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure single-core login throughput for password hash settings.")
+    parser.add_argument('settings', nargs='*',
+                        help="Werkzeug method strings, e.g. pbkdf2:sha256:600000 or scrypt:32768:8:1")
+    parser.add_argument('-m', '--method', help="hash method to sweep, e.g. pbkdf2:sha256 or scrypt")
+    parser.add_argument('-i', '--iterations', type=int, nargs='+', help="costs to sweep with --method")
+    parser.add_argument('-n', '--logins', type=int, default=20, help="logins to time per setting")
+    args = parser.parse_args()
+
+    settings = list(args.settings)
+    if args.method:
+        settings += [hash_method(args.method, cost) for cost in (args.iterations or [None])]
+    settings = settings or DEFAULT_SETTINGS
+
+    print(f"{args.logins} logins per setting, one core")
+    for method in settings:
+        benchmark(method, args.logins)
+
+if __name__ == "__main__":
+    main()
+# Usage: python app/utils/password_benchmark.py [-n 20] [-m pbkdf2:sha256 -i 300000 600000] [<method> ...]
@@ -0,0 +1,46 @@
+# utils/password_hashing.py
+from functools import lru_cache
+
+from flask import current_app
+from werkzeug.security import generate_password_hash
+
+# Password hash cost comes from Config.PASSWORD_HASH_METHOD and
+# PASSWORD_HASH_ITERATIONS. Werkzeug stores the full parameters in front of
+# each hash ("pbkdf2:sha256:600000$salt$hash", "scrypt:32768:8:1$..."), so a
+# stored hash is out of date exactly when that prefix differs from the
+# configured one.
+
+
+def hash_method(method=None, iterations=None):
+    """Werkzeug method string for a method ("scrypt", "pbkdf2:sha256") and cost.
+
+    For pbkdf2 the cost is the iteration count; for scrypt it is the CPU/memory
+    cost N, with r=8 and p=1. Without a cost Werkzeug's default is used.
+    """
+    if iterations is None:
+        return method
+    if method.startswith('pbkdf2'):
+        return f"{method}:{iterations}"
+    if method == 'scrypt':
+        return f"scrypt:{iterations}:8:1"
+    raise ValueError(f"Unsupported password hash method: {method}")
+
+
+def configured_method():
+    return hash_method(current_app.config['PASSWORD_HASH_METHOD'],
+                       current_app.config['PASSWORD_HASH_ITERATIONS'])
+
+
+@lru_cache(maxsize=8)
+def _full_parameters(method):
+    # Resolves library defaults (e.g. "scrypt" -> "scrypt:32768:8:1") by
+    # hashing once; cached, so it costs one hash per process and setting.
+    return generate_password_hash('', method=method).split('$', 1)[0]
+
+
+def hash_password(password):
+    return generate_password_hash(password, method=configured_method())
+
+
+def needs_rehash(stored_hash):
+    return stored_hash.split('$', 1)[0] != _full_parameters(configured_method())
@@ -0,0 +1,67 @@
+import sys
+import os
+import argparse
+import time
+import tracemalloc
+
+# Add project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app import create_app
+from app.models import Reservation
+from app.utils.pdf_generator import generate_invoice_pdf, generate_ticket_pdf
+from app.utils.pdf_layout import warm_layouts
+from app.utils.ticket_data import load_reservation_documents
+from app.utils.ticket_token import make_ticket_token
+
+app = create_app()
+
+
+def benchmark(name, render, iterations):
+    render()  # first call pays for imports and lazy setup
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        render()
+    elapsed = time.perf_counter() - start
+
+    # Measured separately: tracing allocations slows rendering down considerably
+    tracemalloc.start()
+    render()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:<8} {iterations / elapsed:>10.1f} renders/s {elapsed / iterations * 1000:>8.2f} ms/render "
+          f"{peak / 1024:>10.1f} KiB peak")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure single-core PDF throughput of the ticket and invoice generators.")
+    parser.add_argument('-n', '--iterations', type=int, default=200)
+    parser.add_argument('-r', '--reservation', type=int, help="reservation id to render (defaults to the first one)")
+    args = parser.parse_args()
+
+    with app.test_request_context():
+        reservation_id = args.reservation
+        if reservation_id is None:
+            first = Reservation.query.first()
+            reservation_id = first.reservation_id if first else None
+        documents = load_reservation_documents(reservation_id) if reservation_id else None
+        if documents is None:
+            print("No reservation to render. Run create_test_data.py first.")
+            return
+
+        reservation, flight, passengers = documents
+        qr_payload = make_ticket_token(reservation.reservation_id, flight, passengers)
+
+    # Rendering works on plain data, so the loop runs outside any app context
+    warm_layouts()
+    print(f"Reservation {reservation.reservation_id}: {len(passengers)} passenger(s), {args.iterations} iterations")
+    benchmark("ticket", lambda: generate_ticket_pdf(reservation, passengers, flight, qr_payload), args.iterations)
+    benchmark("invoice", lambda: generate_invoice_pdf(reservation, passengers, flight), args.iterations)
+
+if __name__ == "__main__":
+    main()
+# Usage: python app/utils/pdf_benchmark.py [-n 200] [-r <reservation_id>]
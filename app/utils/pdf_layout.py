@@ -0,0 +1,91 @@
+# utils/pdf_layout.py
+from functools import lru_cache
+
+from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+
+FONT = "Helvetica"
+
+
+class PdfLayout:
+    """Static parts of a document, prepared once per process.
+
+    Wrapping the footer paragraph is the most expensive step of rendering a
+    ticket, and its text and font never change, so the line breaks are
+    computed here once and every render just draws the stored lines.
+    """
+
+    def __init__(self, title, title_gap, footer_text, footer_font_size, footer_line_height, footer_align):
+        self.title = title
+        self.title_gap = title_gap
+        self.footer_font_size = footer_font_size
+        self.footer_line_height = footer_line_height
+        self.footer_align = footer_align
+
+        measure = FPDF()
+        measure.add_page()
+        measure.set_font(FONT, 'I', footer_font_size)
+        self.footer_lines = measure.multi_cell(
+            0, footer_line_height, footer_text, align=footer_align,
+            dry_run=True, output="LINES"
+        )
+
+    def start(self):
+        pdf = FPDF()
+        pdf.set_auto_page_break(auto=True, margin=15)
+        pdf.add_page()
+
+        pdf.set_font(FONT, 'B', 16)
+        pdf.cell(0, 10, self.title, align='C', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.ln(self.title_gap)
+        pdf.set_font(FONT, '', 12)
+        return pdf
+
+    def section(self, pdf, heading):
+        pdf.set_font(FONT, 'B', 14)
+        line(pdf, 10, heading)
+        pdf.set_font(FONT, '', 12)
+
+    def footer(self, pdf):
+        pdf.set_font(FONT, 'I', self.footer_font_size)
+        for text in self.footer_lines:
+            pdf.cell(0, self.footer_line_height, text, align=self.footer_align,
+                     new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+
+def line(pdf, h, text):
+    pdf.cell(0, h, text, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+
+@lru_cache(maxsize=None)
+def ticket_layout():
+    return PdfLayout(
+        title="Flight Ticket",
+        title_gap=5,
+        footer_text=(
+            "Please print your physical ticket at the airport using the above QR code. "
+            "This QR code contains your booking reference for verification. "
+            "Keep this ticket with you at all times."
+        ),
+        footer_font_size=11,
+        footer_line_height=8,
+        footer_align='C',
+    )
+
+
+@lru_cache(maxsize=None)
+def invoice_layout():
+    return PdfLayout(
+        title="Invoice",
+        title_gap=10,
+        footer_text="Thank you for booking with us. Please keep this invoice for your records.",
+        footer_font_size=10,
+        footer_line_height=10,
+        footer_align='L',
+    )
+
+
+def warm_layouts():
+    """Build the layouts up front, e.g. before forking render workers."""
+    ticket_layout()
+    invoice_layout()
@@ -0,0 +1,113 @@
+# utils/query_budget.py
+from collections import Counter
+import re
+import traceback
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Test/staging guard against N+1 regressions. With QUERY_BUDGET_MODE set to
+# "log" or "raise", requests to the endpoints listed in QUERY_BUDGETS have
+# their SQL statements counted, in total and per SELECT shape. A request
+# goes over budget when it runs more statements than its endpoint allows,
+# or runs the same SELECT more than QUERY_REPEAT_LIMIT times, which is what
+# a lazy load inside a loop looks like. Writes never count as repeats: a
+# booking flushes one identical INSERT per passenger.
+#
+# Violations are collected while the request runs, each with the stack of
+# the offending statement, and reported once the view has returned, so a
+# view's own error handling can never swallow them or roll back its work.
+
+_IN_LIST = re.compile(r"IN \((?:[^()]*)\)", re.IGNORECASE)
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|:\w+|\?")
+_NUMBER = re.compile(r"\b\d+\b")
+_SPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def statement_shape(statement):
+    """Statement text with parameters, literals and IN-list lengths erased."""
+    shape = _PLACEHOLDER.sub('?', statement)
+    shape = _IN_LIST.sub('IN (?)', shape)
+    shape = _NUMBER.sub('N', shape)
+    return _SPACE.sub(' ', shape).strip()
+
+
+# Frames left out of reports: the ORM internals and the instrumentation hooks
+_HIDDEN_FRAMES = ('/sqlalchemy/', 'utils/query_budget.py', 'utils/metrics.py')
+
+
+def _stack():
+    frames = [
+        frame for frame in traceback.extract_stack()
+        if not any(part in frame.filename.replace('\\', '/') for part in _HIDDEN_FRAMES)
+    ]
+    return ''.join(traceback.format_list(frames[-15:]))
+
+
+def _violation(state, message):
+    state['violations'].append(f"{message} [{request.method} {request.path}]\n{_stack()}")
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not has_request_context():
+        return
+    state = g.get('query_budget')
+    if state is None:
+        return
+
+    state['total'] += 1
+    if state['total'] == state['budget'] + 1:
+        _violation(state, f"{request.endpoint} ran more than its budget of {state['budget']} statements")
+
+    if not statement.lstrip().upper().startswith(('SELECT', 'WITH')):
+        return
+    shape = statement_shape(statement)
+    state['shapes'][shape] += 1
+    if state['shapes'][shape] == state['repeat_limit'] + 1:
+        _violation(
+            state,
+            f"{request.endpoint} ran the same SELECT more than "
+            f"{state['repeat_limit']} times (likely N+1): {shape}"
+        )
+
+
+def init_query_budget(app):
+    """Count statements for budgeted endpoints when QUERY_BUDGET_MODE is "log" or "raise"."""
+    mode = app.config.get('QUERY_BUDGET_MODE', 'off')
+    if mode not in ('log', 'raise'):
+        return
+
+    if not event.contains(Engine, 'after_cursor_execute', _after_cursor_execute):
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+    budgets = app.config.get('QUERY_BUDGETS', {})
+    repeat_limit = app.config.get('QUERY_REPEAT_LIMIT', 5)
+
+    @app.before_request
+    def start_query_budget():
+        budget = budgets.get(request.endpoint)
+        if budget is None:
+            return None
+        g.query_budget = {
+            'budget': budget,
+            'repeat_limit': repeat_limit,
+            'total': 0,
+            'shapes': Counter(),
+            'violations': [],
+        }
+        return None
+
+    @app.after_request
+    def report_query_budget(response):
+        state = g.pop('query_budget', None)
+        if not state or not state['violations']:
+            return response
+        report = '\n'.join(state['violations'])
+        if mode == 'raise':
+            raise QueryBudgetExceeded(report)
+        current_app.logger.warning("Query budget exceeded: %s", report)
+        return response
@@ -0,0 +1,118 @@
+# utils/rate_limit.py
+from collections import OrderedDict
+import math
+from threading import Lock
+import time
+
+from flask import request
+from flask_login import current_user
+from werkzeug.exceptions import TooManyRequests
+
+# Token-bucket rate limiting for the endpoints listed in Config.RATELIMITS.
+# Checks run in before_request, so a throttled client gets its 429 before
+# the view hashes a password or touches the database.
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600}
+
+# Buckets that have been idle long enough to refill completely are dropped
+# at most this often; a missing bucket behaves exactly like a full one. Past
+# MAX_BUCKETS the least recently used bucket is evicted, so filling the table
+# with fresh keys costs one O(1) eviction per request, not a rebuild.
+SWEEP_SECONDS = 60
+MAX_BUCKETS = 100000
+
+
+def parse_rate(value):
+    """'5/minute' -> (5, 60)"""
+    count, period = value.split('/')
+    return int(count), PERIODS[period.strip()]
+
+
+class TokenBucketLimiter:
+    """Token buckets for one limit, one bucket per key.
+
+    A bucket holds up to `capacity` tokens and refills at capacity/period
+    tokens per second. Each bucket is stored as a (tokens, updated_at) tuple
+    and only exists while it is below capacity. Buckets are kept in order of
+    last use, oldest first.
+    """
+
+    def __init__(self, capacity, period):
+        self.capacity = capacity
+        self.period = period
+        self.rate = capacity / period
+        self._buckets = OrderedDict()
+        self._lock = Lock()
+        self._next_sweep = time.monotonic() + SWEEP_SECONDS
+
+    def acquire(self, key, now=None):
+        """Take a token for key. Returns 0 if allowed, else seconds until one is available."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep(now)
+
+            if key in self._buckets:
+                self._buckets.move_to_end(key)
+                tokens, updated_at = self._buckets[key]
+            else:
+                if len(self._buckets) >= MAX_BUCKETS:
+                    self._buckets.popitem(last=False)
+                tokens, updated_at = self.capacity, now
+
+            tokens = min(self.capacity, tokens + (now - updated_at) * self.rate)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                return 0
+            self._buckets[key] = (tokens, now)
+            return (1 - tokens) / self.rate
+
+    def _sweep(self, now):
+        self._next_sweep = now + SWEEP_SECONDS
+        # Oldest first, so stop at the first bucket that has not refilled yet
+        while self._buckets:
+            key, (tokens, updated_at) = next(iter(self._buckets.items()))
+            if now - updated_at < self.period:
+                break
+            del self._buckets[key]
+
+
+def _account_key():
+    email = request.form.get('email', '').strip().lower()
+    if email:
+        return email
+    if current_user.is_authenticated:
+        return current_user.get_id()
+    return None
+
+
+def init_rate_limits(app):
+    """Register the before_request check for every policy in app.config['RATELIMITS']."""
+    if not app.config.get('RATELIMIT_ENABLED', True):
+        return
+
+    policies = {}
+    for endpoint, policy in app.config.get('RATELIMITS', {}).items():
+        policies[endpoint] = (
+            set(policy.get('methods') or ()),
+            {scope: TokenBucketLimiter(*parse_rate(policy[scope]))
+             for scope in ('ip', 'account') if policy.get(scope)},
+        )
+
+    @app.before_request
+    def check_rate_limits():
+        policy = policies.get(request.endpoint)
+        if policy is None:
+            return None
+        methods, limiters = policy
+        if methods and request.method not in methods:
+            return None
+
+        for scope, limiter in limiters.items():
+            key = request.remote_addr if scope == 'ip' else _account_key()
+            if key is None:
+                continue
+            retry_after = limiter.acquire(key)
+            if retry_after:
+                raise TooManyRequests(retry_after=math.ceil(retry_after))
+        return None
@@ -0,0 +1,30 @@
+import sys
+import os
+import argparse
+from datetime import datetime
+
+# Add project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app import create_app
+from app.utils.revenue_rollup import rebuild_rollup
+
+app = create_app()
+
+
+def parse_date(value):
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the daily_revenue rollup from invoices.")
+    parser.add_argument('--start', type=parse_date, help="first day to rebuild (YYYY-MM-DD)")
+    parser.add_argument('--end', type=parse_date, help="last day to rebuild (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    with app.app_context():
+        rebuild_rollup(args.start, args.end)
+        print("Revenue rollup rebuilt successfully.")
+# Backfills daily_revenue for the whole history, or only the given date range.
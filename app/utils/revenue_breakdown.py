@@ -0,0 +1,149 @@
+# utils/revenue_breakdown.py
+from datetime import datetime, time, timedelta
+
+from sqlalchemy import func
+from sqlalchemy.orm import aliased
+from app import db
+from app.models import (
+    Aircraft, Airline, Airport, Flight, FlightTemplate, Invoice, Reservation,
+    ReservationSeat, ReservationStatus, Seat
+)
+from app.utils.cache import TTLCache
+
+# Breakdowns change only as bookings come in; a few minutes of staleness is
+# fine for revenue reporting and keeps repeated page views off the database.
+_breakdown_cache = TTLCache(maxsize=64, ttl=300)
+
+
+def _breakdown_rows(start, end):
+    """One row per (flight template, seat class) for flights departing in [start, end].
+
+    Templates that flew but sold nothing still appear, with a NULL class, so
+    their seats count towards capacity.
+    """
+    window = (
+        Flight.departure_datetime >= datetime.combine(start, time.min),
+        Flight.departure_datetime < datetime.combine(end + timedelta(days=1), time.min),
+    )
+
+    # Seats per reservation, so each invoice is counted once per group
+    reservation_seats = db.session.query(
+        ReservationSeat.reservation_id,
+        ReservationSeat.flight_id,
+        Seat.class_.label('seat_class'),
+        func.count().label('seats'),
+    ).join(Seat, ReservationSeat.seat_id == Seat.seat_id).group_by(
+        ReservationSeat.reservation_id, ReservationSeat.flight_id, Seat.class_
+    ).subquery()
+
+    sales = db.session.query(
+        Flight.flight_template_id.label('flight_template_id'),
+        reservation_seats.c.seat_class,
+        func.sum(reservation_seats.c.seats).label('seats_sold'),
+        func.sum(Invoice.amount).label('revenue'),
+    ).select_from(reservation_seats).join(
+        Reservation, Reservation.reservation_id == reservation_seats.c.reservation_id
+    ).join(
+        Invoice, Invoice.reservation_id == Reservation.reservation_id
+    ).join(
+        Flight, Flight.flight_id == reservation_seats.c.flight_id
+    ).filter(
+        Reservation.status == ReservationStatus.Confirmed, *window
+    ).group_by(Flight.flight_template_id, reservation_seats.c.seat_class).subquery()
+
+    flown = db.session.query(
+        Flight.flight_template_id.label('flight_template_id'),
+        func.count(Flight.flight_id).label('flights'),
+    ).filter(*window).group_by(Flight.flight_template_id).subquery()
+
+    dep = aliased(Airport)
+    arr = aliased(Airport)
+    return db.session.query(
+        FlightTemplate.flight_template_id,
+        Airline.name,
+        dep.IATA_code,
+        arr.IATA_code,
+        FlightTemplate.flight_type,
+        flown.c.flights * Aircraft.total_seats,
+        sales.c.seat_class,
+        sales.c.seats_sold,
+        sales.c.revenue,
+    ).select_from(flown).join(
+        FlightTemplate, FlightTemplate.flight_template_id == flown.c.flight_template_id
+    ).join(
+        Airline, FlightTemplate.airline_id == Airline.airline_id
+    ).join(
+        Aircraft, FlightTemplate.aircraft_id == Aircraft.aircraft_id
+    ).join(
+        dep, FlightTemplate.departure_airport_id == dep.airport_id
+    ).join(
+        arr, FlightTemplate.arrival_airport_id == arr.airport_id
+    ).outerjoin(
+        sales, sales.c.flight_template_id == FlightTemplate.flight_template_id
+    ).all()
+
+
+def _summarise(groups):
+    result = []
+    for name, group in groups.items():
+        capacity = sum(group['capacity'].values())
+        result.append({
+            'name': name,
+            'seats_sold': group['seats_sold'],
+            'revenue': group['revenue'],
+            'capacity': capacity,
+            'load_factor': group['seats_sold'] / capacity * 100 if capacity else 0,
+        })
+    return sorted(result, key=lambda row: row['revenue'], reverse=True)
+
+
+def revenue_breakdown(start, end):
+    """Revenue, seats sold and load factor by airline, route, seat class and flight type.
+
+    Load factor is seats sold over seats flown (flights x Aircraft.total_seats).
+    For the seat-class view the denominator is the whole aircraft, so the
+    class rows add up to the overall load factor.
+    """
+    cache_key = (start, end)
+    cached = _breakdown_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    dimensions = ('airline', 'route', 'seat_class', 'flight_type')
+    groups = {dimension: {} for dimension in dimensions}
+    totals = {'seats_sold': 0, 'revenue': 0, 'capacity': {}}
+
+    for template_id, airline, dep, arr, flight_type, capacity, seat_class, seats_sold, revenue in _breakdown_rows(start, end):
+        keys = {
+            'airline': airline,
+            'route': f"{dep}-{arr}",
+            'seat_class': seat_class.value if seat_class else None,
+            'flight_type': flight_type.value,
+        }
+        for dimension in dimensions:
+            if keys[dimension] is None:
+                continue
+            group = groups[dimension].setdefault(keys[dimension], {'seats_sold': 0, 'revenue': 0, 'capacity': {}})
+            group['seats_sold'] += seats_sold or 0
+            group['revenue'] += revenue or 0
+            # Capacity belongs to the template, not the class row, so count it once
+            group['capacity'][template_id] = capacity
+
+        totals['seats_sold'] += seats_sold or 0
+        totals['revenue'] += revenue or 0
+        totals['capacity'][template_id] = capacity
+
+    total_capacity = sum(totals['capacity'].values())
+    for group in groups['seat_class'].values():
+        group['capacity'] = totals['capacity']
+
+    breakdown = {dimension: _summarise(groups[dimension]) for dimension in dimensions}
+    breakdown['totals'] = {
+        'seats_sold': totals['seats_sold'],
+        'revenue': totals['revenue'],
+        'capacity': total_capacity,
+        'load_factor': totals['seats_sold'] / total_capacity * 100 if total_capacity else 0,
+    }
+
+    _breakdown_cache.set(cache_key, breakdown)
+    return breakdown
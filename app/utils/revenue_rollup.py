@@ -0,0 +1,233 @@
+# utils/revenue_rollup.py
+from datetime import date, datetime
+
+from sqlalchemy import case, func, insert, select
+from sqlalchemy.orm import aliased
+from app import db
+from app.models import (
+    Airport, DailyRevenue, Flight, FlightTemplate, Invoice, Reservation,
+    ReservationSeat, ReservationStatus, Seat
+)
+
+# daily_revenue holds one row per (day, airline, route, seat class). Rows are
+# bumped in the same transaction as the booking or refund that changes them,
+# so the admin pages read a few hundred small rows instead of aggregating
+# the whole invoices table. A reservation counts on the day it was invoiced,
+# and its refund is booked against that same day so a rebuild gives the
+# same numbers.
+
+KEY_COLUMNS = ('date', 'airline_id', 'route', 'class_')
+
+
+def _upsert(values):
+    table = DailyRevenue.__table__
+    dialect = db.session.get_bind().dialect.name
+
+    if dialect == 'mysql':
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        stmt = mysql_insert(table).values(**values)
+        stmt = stmt.on_duplicate_key_update(
+            bookings=table.c.bookings + stmt.inserted.bookings,
+            gross=table.c.gross + stmt.inserted.gross,
+            refunds=table.c.refunds + stmt.inserted.refunds,
+        )
+    elif dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        stmt = dialect_insert(table).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c[name] for name in KEY_COLUMNS],
+            set_={
+                'bookings': table.c.bookings + stmt.excluded.bookings,
+                'gross': table.c.gross + stmt.excluded.gross,
+                'refunds': table.c.refunds + stmt.excluded.refunds,
+            },
+        )
+    else:
+        key = [table.c[name] == values[name] for name in KEY_COLUMNS]
+        updated = db.session.execute(
+            table.update().where(*key).values(
+                bookings=table.c.bookings + values['bookings'],
+                gross=table.c.gross + values['gross'],
+                refunds=table.c.refunds + values['refunds'],
+            )
+        )
+        if updated.rowcount:
+            return
+        stmt = insert(table).values(**values)
+
+    db.session.execute(stmt)
+
+
+def _route(flight_template):
+    return f"{flight_template.departure_airport.IATA_code}-{flight_template.arrival_airport.IATA_code}"
+
+
+def record_booking(flight, seat_class, amount, booked_on=None):
+    """Add a new reservation to the rollup. The caller commits."""
+    _upsert({
+        'date': booked_on or datetime.utcnow().date(),
+        'airline_id': flight.flight_template.airline_id,
+        'route': _route(flight.flight_template),
+        'class_': seat_class,
+        'bookings': 1,
+        'gross': amount,
+        'refunds': 0,
+    })
+
+
+def record_refund(reservation, refund_amount):
+    """Book a refund against the day the reservation was invoiced. The caller commits."""
+    reservation_seat = reservation.reservation_seats[0]
+    issued = reservation.invoice.issued_date if reservation.invoice else reservation.reservation_date
+    _upsert({
+        'date': issued.date(),
+        'airline_id': reservation_seat.flight.flight_template.airline_id,
+        'route': _route(reservation_seat.flight.flight_template),
+        'class_': reservation_seat.seat.class_,
+        'bookings': 0,
+        'gross': 0,
+        'refunds': refund_amount,
+    })
+
+
+def _first_seat():
+    return db.session.query(
+        ReservationSeat.reservation_id,
+        func.min(ReservationSeat.flight_id).label('flight_id'),
+        func.min(ReservationSeat.seat_id).label('seat_id'),
+    ).group_by(ReservationSeat.reservation_id).subquery()
+
+
+def record_bulk_refunds(*criteria):
+    """Book full refunds for every reservation matching criteria. The caller commits.
+
+    Refunds are summed per rollup row in SQL, so cancelling a flight costs
+    one upsert per (day, airline, route, class) rather than per booking.
+    Run it before the reservations change status.
+    """
+    first_seat = _first_seat()
+    dep = aliased(Airport)
+    arr = aliased(Airport)
+    day = func.date(Invoice.issued_date)
+    route = dep.IATA_code + '-' + arr.IATA_code
+
+    groups = db.session.query(
+        day, FlightTemplate.airline_id, route, Seat.class_, func.sum(Reservation.total_price)
+    ).select_from(Invoice).join(
+        Reservation, Invoice.reservation_id == Reservation.reservation_id
+    ).join(
+        first_seat, first_seat.c.reservation_id == Reservation.reservation_id
+    ).join(
+        Seat, Seat.seat_id == first_seat.c.seat_id
+    ).join(
+        Flight, Flight.flight_id == first_seat.c.flight_id
+    ).join(
+        FlightTemplate, Flight.flight_template_id == FlightTemplate.flight_template_id
+    ).join(
+        dep, FlightTemplate.departure_airport_id == dep.airport_id
+    ).join(
+        arr, FlightTemplate.arrival_airport_id == arr.airport_id
+    ).filter(*criteria).group_by(day, FlightTemplate.airline_id, route, Seat.class_).all()
+
+    for issued, airline_id, route_code, seat_class, refunds in groups:
+        _upsert({
+            # SQLite's date() returns text
+            'date': date.fromisoformat(issued) if isinstance(issued, str) else issued,
+            'airline_id': airline_id,
+            'route': route_code,
+            'class_': seat_class,
+            'bookings': 0,
+            'gross': 0,
+            'refunds': refunds,
+        })
+
+
+def rebuild_rollup(start=None, end=None):
+    """Recompute daily_revenue from invoices, optionally for [start, end] only.
+
+    Each reservation is attributed to the flight and seat class of its first
+    seat. Non-confirmed reservations carry the refunded amount on their
+    invoice, which is what the refund handlers store there.
+    """
+    first_seat = _first_seat()
+
+    dep = aliased(Airport)
+    arr = aliased(Airport)
+    day = func.date(Invoice.issued_date)
+    route = dep.IATA_code + '-' + arr.IATA_code
+
+    source = select(
+        day,
+        FlightTemplate.airline_id,
+        route,
+        Seat.class_,
+        func.count(Reservation.reservation_id),
+        func.sum(Reservation.total_price),
+        func.sum(case((Reservation.status != ReservationStatus.Confirmed, Invoice.amount), else_=0)),
+    ).select_from(Invoice).join(
+        Reservation, Invoice.reservation_id == Reservation.reservation_id
+    ).join(
+        first_seat, first_seat.c.reservation_id == Reservation.reservation_id
+    ).join(
+        Seat, Seat.seat_id == first_seat.c.seat_id
+    ).join(
+        Flight, Flight.flight_id == first_seat.c.flight_id
+    ).join(
+        FlightTemplate, Flight.flight_template_id == FlightTemplate.flight_template_id
+    ).join(
+        dep, FlightTemplate.departure_airport_id == dep.airport_id
+    ).join(
+        arr, FlightTemplate.arrival_airport_id == arr.airport_id
+    ).group_by(day, FlightTemplate.airline_id, route, Seat.class_)
+
+    delete = DailyRevenue.__table__.delete()
+    if start:
+        source = source.where(Invoice.issued_date >= start)
+        delete = delete.where(DailyRevenue.date >= start)
+    if end:
+        source = source.where(day <= end)
+        delete = delete.where(DailyRevenue.date <= end)
+
+    db.session.execute(delete)
+    db.session.execute(
+        insert(DailyRevenue).from_select(
+            ['date', 'airline_id', 'route', 'class_', 'bookings', 'gross', 'refunds'], source
+        )
+    )
+    db.session.commit()
+
+
+def _month_start(day, months_back=0):
+    years, month = divmod(day.month - 1 - months_back, 12)
+    return date(day.year + years, month + 1, 1)
+
+
+def revenue_totals():
+    """All-time (net revenue, reservations) from the rollup."""
+    revenue, bookings = db.session.query(
+        func.sum(DailyRevenue.gross - DailyRevenue.refunds),
+        func.sum(DailyRevenue.bookings),
+    ).one()
+    return revenue or 0, bookings or 0
+
+
+def revenue_by_month(months=6):
+    """Net revenue per calendar month, most recent month first."""
+    today = datetime.utcnow().date()
+    month_starts = [_month_start(today, i) for i in range(months)]
+
+    rows = db.session.query(
+        DailyRevenue.date, func.sum(DailyRevenue.gross - DailyRevenue.refunds)
+    ).filter(
+        DailyRevenue.date >= month_starts[-1]
+    ).group_by(DailyRevenue.date).all()
+
+    totals = {start: 0 for start in month_starts}
+    for day, revenue in rows:
+        month = _month_start(day)
+        if month in totals:
+            totals[month] += revenue or 0
+    return [(start, totals[start]) for start in month_starts]
@@ -0,0 +1,68 @@
+import sys
+import os
+import argparse
+from datetime import datetime
+
+# Add project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app import create_app, db
+from app.models import Notification, User, Flight, FlightTemplate
+from app.utils.flight_cancellation import FLIGHT_CANCELLED
+
+app = create_app()
+
+MESSAGES = {
+    FLIGHT_CANCELLED: "Flight {flight_number} on {departure:%Y-%m-%d %H:%M} has been cancelled. "
+                      "Booking #{reservation_id} has been refunded in full.",
+}
+
+
+def deliver(email, message):
+    # No mail transport is configured for the app yet; print so an operator
+    # or a wrapper script can forward the messages.
+    print(f"{email}: {message}")
+
+
+def send_pending(batch_size):
+    pending = db.session.query(
+        Notification.notification_id, Notification.kind, Notification.reservation_id,
+        User.email, FlightTemplate.flight_number, Flight.departure_datetime
+    ).join(
+        User, Notification.user_id == User.user_id
+    ).outerjoin(
+        Flight, Notification.flight_id == Flight.flight_id
+    ).outerjoin(
+        FlightTemplate, Flight.flight_template_id == FlightTemplate.flight_template_id
+    ).filter(
+        Notification.sent_at.is_(None)
+    ).order_by(Notification.notification_id).limit(batch_size).all()
+
+    for notification_id, kind, reservation_id, email, flight_number, departure in pending:
+        deliver(email, MESSAGES[kind].format(flight_number=flight_number, departure=departure,
+                                             reservation_id=reservation_id))
+
+    if pending:
+        db.session.query(Notification).filter(
+            Notification.notification_id.in_([row[0] for row in pending])
+        ).update({'sent_at': datetime.utcnow()}, synchronize_session=False)
+        db.session.commit()
+    return len(pending)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Deliver queued passenger notifications.")
+    parser.add_argument('-b', '--batch-size', type=int, default=500, help="notifications per batch")
+    args = parser.parse_args()
+
+    with app.app_context():
+        total = 0
+        while True:
+            sent = send_pending(args.batch_size)
+            total += sent
+            if sent < args.batch_size:
+                break
+        print(f"Sent {total} notifications.")
+# Run periodically (e.g. from cron) to drain the notifications outbox.
@@ -0,0 +1,205 @@
+# utils/slow_query_log.py
+from datetime import datetime
+import json
+import logging
+from logging.handlers import RotatingFileHandler
+import os
+import queue
+from threading import Lock, Thread, local
+import time
+
+from flask import has_request_context, request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
+
+from app.utils.query_budget import statement_shape
+
+# Opt-in slow-query recorder. Any statement slower than
+# SLOW_QUERY_THRESHOLD_MS is written as one JSON line with its SQL, the
+# route that ran it and the database's plan for it. The file rotates by
+# size; several gunicorn workers append to it safely, but each rotates on
+# its own, so keep the backup count generous when running more than one.
+#
+# The plan is taken by a background thread in each process on its own
+# unpooled connection, so a slow request neither waits for EXPLAIN nor
+# holds a second connection from the app's pool. Bind parameters are only
+# written with SLOW_QUERY_LOG_PARAMETERS, and never for statements that
+# touch a sensitive column.
+
+EXPLAIN_PREFIXES = {
+    'sqlite': 'EXPLAIN QUERY PLAN ',
+    'mysql': 'EXPLAIN ',
+    'postgresql': 'EXPLAIN ',
+}
+MAX_PARAMETER_LENGTH = 200
+# Entries waiting for a plan; past this the entry is written without one
+PLAN_QUEUE_SIZE = 100
+SENSITIVE_COLUMNS = ('password',)
+
+_logger = logging.getLogger('skylink.slow_queries')
+_logger.propagate = False
+_explaining = local()
+_settings = {}
+
+_plan_queue = None
+_plan_worker_pid = None
+_plan_worker_lock = Lock()
+_explain_engines = {}
+
+
+def _jsonable(value):
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    text = value if isinstance(value, str) else repr(value)
+    return text[:MAX_PARAMETER_LENGTH]
+
+
+def _parameters(statement, parameters):
+    if any(column in statement.lower() for column in SENSITIVE_COLUMNS):
+        return '[redacted]'
+    if isinstance(parameters, dict):
+        return {key: _jsonable(value) for key, value in parameters.items()}
+    return [_jsonable(value) for value in parameters or ()]
+
+
+def _explain(url, statement, parameters):
+    engine = _explain_engines.get(url)
+    if engine is None:
+        engine = _explain_engines[url] = create_engine(url, poolclass=NullPool)
+    try:
+        with engine.connect() as conn:
+            result = conn.exec_driver_sql(EXPLAIN_PREFIXES[engine.dialect.name] + statement, parameters or ())
+            return [{key: _jsonable(value) for key, value in row._mapping.items()} for row in result]
+    except Exception as e:
+        return [{'error': _jsonable(e)}]
+
+
+def _plan_worker(plan_queue):
+    # Statements run here are EXPLAINs; never record them as slow queries
+    _explaining.active = True
+    while True:
+        entry, url, statement, parameters = plan_queue.get()
+        entry['plan'] = _explain(url, statement, parameters)
+        _logger.info(json.dumps(entry, default=str))
+
+
+def _queue_for_plan():
+    """This process's plan queue, starting its worker thread on first use (after any fork)."""
+    global _plan_queue, _plan_worker_pid
+    if _plan_worker_pid != os.getpid():
+        with _plan_worker_lock:
+            if _plan_worker_pid != os.getpid():
+                _plan_queue = queue.Queue(maxsize=PLAN_QUEUE_SIZE)
+                Thread(target=_plan_worker, args=(_plan_queue,), name='slow-query-plans', daemon=True).start()
+                _plan_worker_pid = os.getpid()
+    return _plan_queue
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context, which goes away with the statement even if it fails
+    context._slow_query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - context._slow_query_start) * 1000
+    if elapsed_ms < _settings['threshold_ms'] or getattr(_explaining, 'active', False):
+        return
+
+    entry = {
+        'time': datetime.utcnow().isoformat(timespec='seconds'),
+        'duration_ms': round(elapsed_ms, 1),
+        'fingerprint': statement_shape(statement),
+        'statement': statement,
+        'parameters': _parameters(statement, parameters) if _settings['parameters'] and not executemany else None,
+        'route': f"{request.method} {request.endpoint}" if has_request_context() else None,
+        'path': request.path if has_request_context() else None,
+        'database': conn.engine.url.database,
+        'plan': None,
+    }
+    explainable = (
+        not executemany
+        and conn.engine.dialect.name in EXPLAIN_PREFIXES
+        and statement.lstrip().upper().startswith(('SELECT', 'WITH'))
+    )
+    if explainable:
+        try:
+            _queue_for_plan().put_nowait((entry, conn.engine.url, statement, parameters))
+            return
+        except queue.Full:
+            pass
+    _logger.info(json.dumps(entry, default=str))
+
+
+def log_files(app):
+    path = app.config['SLOW_QUERY_LOG_PATH'] or os.path.join(app.instance_path, 'slow_queries.jsonl')
+    backups = app.config['SLOW_QUERY_LOG_BACKUPS']
+    return [path] + [f"{path}.{n}" for n in range(1, backups + 1)]
+
+
+def init_slow_query_log(app):
+    """Start recording slow statements if SLOW_QUERY_LOG_ENABLED is set."""
+    if not app.config.get('SLOW_QUERY_LOG_ENABLED'):
+        return
+
+    path = log_files(app)[0]
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    if not _logger.handlers:
+        handler = RotatingFileHandler(
+            path, maxBytes=app.config['SLOW_QUERY_LOG_MAX_BYTES'],
+            backupCount=app.config['SLOW_QUERY_LOG_BACKUPS'], encoding='utf-8'
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        _logger.addHandler(handler)
+        _logger.setLevel(logging.INFO)
+
+    _settings['threshold_ms'] = app.config['SLOW_QUERY_THRESHOLD_MS']
+    _settings['parameters'] = app.config.get('SLOW_QUERY_LOG_PARAMETERS', False)
+    if not event.contains(Engine, 'after_cursor_execute', _after_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def _read_entries(app):
+    for path in log_files(app):
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding='utf-8') as log:
+            for line in log:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue  # a line cut short by rotation
+
+
+def slow_query_summary(app):
+    """Logged statements grouped by fingerprint, slowest total time first.
+
+    Each group keeps the plan and parameters of its slowest occurrence.
+    """
+    groups = {}
+    for entry in _read_entries(app):
+        group = groups.get(entry['fingerprint'])
+        if group is None:
+            group = groups[entry['fingerprint']] = {
+                'fingerprint': entry['fingerprint'],
+                'count': 0,
+                'total_ms': 0.0,
+                'routes': set(),
+                'last_seen': entry['time'],
+                'slowest': entry,
+            }
+        group['count'] += 1
+        group['total_ms'] += entry['duration_ms']
+        group['last_seen'] = max(group['last_seen'], entry['time'])
+        if entry['route']:
+            group['routes'].add(entry['route'])
+        if entry['duration_ms'] > group['slowest']['duration_ms']:
+            group['slowest'] = entry
+
+    summary = sorted(groups.values(), key=lambda group: group['total_ms'], reverse=True)
+    for group in summary:
+        group['avg_ms'] = group['total_ms'] / group['count']
+        group['max_ms'] = group['slowest']['duration_ms']
+        group['routes'] = sorted(group['routes'])
+    return summary
@@ -0,0 +1,87 @@
+# utils/ticket_batch.py
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import atexit
+import io
+import multiprocessing
+import os
+from threading import Lock
+import zipfile
+
+from app.utils.pdf_generator import generate_ticket_pdf
+from app.utils.pdf_layout import warm_layouts
+from app.utils.ticket_token import make_ticket_token
+
+# Below this many tickets the cost of starting worker processes outweighs the gain
+MIN_PARALLEL_TICKETS = 8
+
+# One render pool per web worker process, started by its first batch of
+# MIN_PARALLEL_TICKETS or more and reused by every later one; each render
+# process warms the PDF layouts as it starts. Its processes come from a
+# forkserver (spawn where that is unavailable), never from forking the
+# threaded web worker, so they cannot inherit a lock some other request
+# thread was holding.
+_pool = None
+_pool_pid = None
+_pool_lock = Lock()
+
+
+def _ticket_job(reservation, passenger, flight):
+    filename = f"TKT-{reservation.reservation_id:06d}-{passenger.seat_number}.pdf"
+    qr_payload = make_ticket_token(reservation.reservation_id, flight, [passenger])
+    return filename, reservation, passenger, flight, qr_payload
+
+
+def _render_ticket(job):
+    filename, reservation, passenger, flight, qr_payload = job
+    return filename, bytes(generate_ticket_pdf(reservation, [passenger], flight, qr_payload))
+
+
+def _render_pool(workers):
+    global _pool, _pool_pid
+    with _pool_lock:
+        # A pool made before gunicorn forked belongs to the master
+        if _pool is None or _pool_pid != os.getpid():
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            context = multiprocessing.get_context(method)
+            if method == 'forkserver':
+                context.set_forkserver_preload(['app.utils.ticket_batch'])
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=warm_layouts)
+            _pool_pid = os.getpid()
+            atexit.register(_pool.shutdown, wait=False)
+        return _pool
+
+
+def _discard_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+def render_flight_tickets(flight, documents, workers=1):
+    """Render one ticket per passenger and return them zipped together.
+
+    `flight` and `documents` come from ticket_data.load_flight_info and
+    load_flight_documents; they are plain data, so they pickle cleanly to
+    the worker processes.
+    """
+    jobs = [_ticket_job(reservation, passenger, flight) for reservation, passenger in documents]
+
+    if workers > 1 and len(jobs) >= MIN_PARALLEL_TICKETS:
+        pool = _render_pool(workers)
+        try:
+            rendered = list(pool.map(_render_ticket, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+        except BrokenProcessPool:
+            # A render process died; start a fresh pool next time and finish this batch here
+            _discard_pool(pool)
+            rendered = [_render_ticket(job) for job in jobs]
+    else:
+        rendered = [_render_ticket(job) for job in jobs]
+
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w', zipfile.ZIP_STORED) as zf:
+        for filename, pdf_bytes in rendered:
+            zf.writestr(filename, pdf_bytes)
+    return archive.getvalue()
@@ -0,0 +1,132 @@
+# utils/ticket_data.py
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy.orm import aliased
+from app import db
+from app.models import (
+    User, Passenger, Airline, Airport, FlightTemplate, Flight,
+    Seat, Reservation, ReservationSeat, ReservationStatus
+)
+
+# Plain-data views of a booking for the PDF generators. They are built from
+# a single joined query so rendering never touches the session and can run
+# in worker processes.
+
+
+@dataclass(frozen=True)
+class ReservationInfo:
+    reservation_id: int
+    user_id: int
+    reservation_date: datetime
+    total_price: float
+    payment_method: str
+    status: str
+    user_name: str
+    user_email: str
+
+
+@dataclass(frozen=True)
+class FlightInfo:
+    flight_id: int
+    flight_number: str
+    airline_name: str
+    departure_airport_name: str
+    departure_iata: str
+    arrival_airport_name: str
+    arrival_iata: str
+    departure_datetime: datetime
+    arrival_datetime: datetime
+
+
+@dataclass(frozen=True)
+class PassengerSeat:
+    first_name: str
+    last_name: str
+    contact_number: str
+    seat_number: str
+    seat_class: str
+    seat_position: str
+
+
+def _document_rows(*criteria):
+    dep = aliased(Airport)
+    arr = aliased(Airport)
+    return db.session.query(
+        Reservation.reservation_id, Reservation.user_id, Reservation.reservation_date,
+        Reservation.total_price, Reservation.payment_method, Reservation.status,
+        User.name, User.email,
+        Flight.flight_id, FlightTemplate.flight_number, Airline.name,
+        dep.name, dep.IATA_code, arr.name, arr.IATA_code,
+        Flight.departure_datetime, Flight.arrival_datetime,
+        Passenger.first_name, Passenger.last_name, Passenger.contact_number,
+        Seat.seat_number, Seat.class_, Seat.position,
+    ).select_from(ReservationSeat).join(
+        Reservation, ReservationSeat.reservation_id == Reservation.reservation_id
+    ).join(
+        User, Reservation.user_id == User.user_id
+    ).join(
+        Flight, ReservationSeat.flight_id == Flight.flight_id
+    ).join(
+        FlightTemplate, Flight.flight_template_id == FlightTemplate.flight_template_id
+    ).join(
+        Airline, FlightTemplate.airline_id == Airline.airline_id
+    ).join(
+        dep, FlightTemplate.departure_airport_id == dep.airport_id
+    ).join(
+        arr, FlightTemplate.arrival_airport_id == arr.airport_id
+    ).join(
+        Passenger, ReservationSeat.passenger_id == Passenger.passenger_id
+    ).join(
+        Seat, ReservationSeat.seat_id == Seat.seat_id
+    ).filter(*criteria).order_by(
+        ReservationSeat.reservation_id, ReservationSeat.passenger_id
+    ).all()
+
+
+def _reservation_info(row):
+    return ReservationInfo(row[0], row[1], row[2], row[3], row[4], row[5].value, row[6], row[7])
+
+
+def _flight_info(row):
+    return FlightInfo(*row[8:17])
+
+
+def _passenger_seat(row):
+    return PassengerSeat(row[17], row[18], row[19], row[20], row[21].value, row[22].value)
+
+
+def load_reservation_documents(reservation_id):
+    """Return (reservation, flight, passengers) for one booking, or None if it has no seats."""
+    rows = _document_rows(ReservationSeat.reservation_id == reservation_id)
+    if not rows:
+        return None
+    return _reservation_info(rows[0]), _flight_info(rows[0]), [_passenger_seat(row) for row in rows]
+
+
+def load_flight_documents(flight_id):
+    """Return (reservation, passenger) pairs for every confirmed passenger on a flight."""
+    rows = _document_rows(
+        ReservationSeat.flight_id == flight_id,
+        Reservation.status == ReservationStatus.Confirmed
+    )
+    return [(_reservation_info(row), _passenger_seat(row)) for row in rows]
+
+
+def load_flight_info(flight_id):
+    dep = aliased(Airport)
+    arr = aliased(Airport)
+    row = db.session.query(
+        Flight.flight_id, FlightTemplate.flight_number, Airline.name,
+        dep.name, dep.IATA_code, arr.name, arr.IATA_code,
+        Flight.departure_datetime, Flight.arrival_datetime,
+    ).select_from(Flight).join(
+        FlightTemplate, Flight.flight_template_id == FlightTemplate.flight_template_id
+    ).join(
+        Airline, FlightTemplate.airline_id == Airline.airline_id
+    ).join(
+        dep, FlightTemplate.departure_airport_id == dep.airport_id
+    ).join(
+        arr, FlightTemplate.arrival_airport_id == arr.airport_id
+    ).filter(Flight.flight_id == flight_id).first()
+    return FlightInfo(*row) if row else None
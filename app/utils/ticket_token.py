@@ -0,0 +1,113 @@
+# utils/ticket_token.py
+from datetime import datetime, timedelta
+from functools import lru_cache
+import hashlib
+import time
+
+from flask import current_app
+from itsdangerous import BadSignature, URLSafeSerializer
+
+TICKET_TOKEN_SALT = 'skylink-ticket'
+
+# Reservations whose tickets must no longer verify. Refreshed from the
+# database at most once per REVOCATION_REFRESH_SECONDS so that refunds made
+# in other worker processes are picked up without a query per scan.
+REVOCATION_REFRESH_SECONDS = 60
+# Tickets stop verifying this long after departure, so only revocations on
+# flights inside that window need to be held in memory
+TICKET_GRACE_AFTER_DEPARTURE = timedelta(hours=24)
+_revoked_reservations = set()
+_revocations_loaded_at = None
+
+
+@lru_cache(maxsize=8)
+def _serializer(key):
+    return URLSafeSerializer(key, salt=TICKET_TOKEN_SALT,
+                             signer_kwargs={'digest_method': hashlib.sha256})
+
+
+def make_ticket_token(reservation_id, flight, passengers, key=None):
+    """Signed QR payload for a ticket; the same booking always yields the same token.
+
+    Besides the ids it embeds a short flight and passenger summary so gate
+    staff can verify a ticket without looking anything up.
+    """
+    key = key or current_app.config['TICKET_SIGNING_KEY']
+    payload = {
+        'r': reservation_id,
+        'f': flight.flight_id,
+        'n': flight.flight_number,
+        'rt': f"{flight.departure_iata}-{flight.arrival_iata}",
+        'd': flight.departure_datetime.strftime('%Y-%m-%dT%H:%M'),
+        'p': [
+            [f"{p.first_name} {p.last_name}", p.seat_number, p.seat_class]
+            for p in passengers
+        ],
+    }
+    return _serializer(key).dumps(payload)
+
+
+def decode_ticket_token(token, key):
+    """Return the readable ticket summary, or None if the signature is bad."""
+    try:
+        payload = _serializer(key).loads(token)
+    except BadSignature:
+        return None
+    return {
+        'reservation_id': payload['r'],
+        'flight_id': payload['f'],
+        'flight_number': payload['n'],
+        'route': payload['rt'],
+        'departure': payload['d'],
+        'passengers': [
+            {'name': name, 'seat': seat, 'class': seat_class}
+            for name, seat, seat_class in payload['p']
+        ],
+    }
+
+
+def revoke_ticket(reservation_id):
+    _revoked_reservations.add(reservation_id)
+
+
+def load_revocations():
+    """Reload the revoked reservations on flights whose tickets can still verify.
+
+    The scan starts from the departure_datetime index, so its cost follows
+    the flights in the window rather than every reservation ever made.
+    """
+    global _revoked_reservations, _revocations_loaded_at
+    from app import db
+    from app.models import Flight, Reservation, ReservationSeat, ReservationStatus
+
+    rows = db.session.query(Reservation.reservation_id).join(
+        ReservationSeat, ReservationSeat.reservation_id == Reservation.reservation_id
+    ).join(
+        Flight, ReservationSeat.flight_id == Flight.flight_id
+    ).filter(
+        Flight.departure_datetime >= datetime.utcnow() - TICKET_GRACE_AFTER_DEPARTURE,
+        Reservation.status != ReservationStatus.Confirmed
+    ).distinct().all()
+    # Swap in the new set in one assignment; clearing and refilling the old
+    # one would let a concurrent verify see it empty
+    _revoked_reservations = {r[0] for r in rows}
+    _revocations_loaded_at = time.monotonic()
+
+
+def verify_ticket_token(token, key=None):
+    """Check a scanned token. Returns (ticket, error) where error is None if valid."""
+    key = key or current_app.config['TICKET_SIGNING_KEY']
+    ticket = decode_ticket_token(token, key)
+    if ticket is None:
+        return None, 'Invalid ticket signature'
+
+    departure = datetime.strptime(ticket['departure'], '%Y-%m-%dT%H:%M')
+    if departure + TICKET_GRACE_AFTER_DEPARTURE < datetime.utcnow():
+        return ticket, 'Ticket has expired'
+
+    if _revocations_loaded_at is None or time.monotonic() - _revocations_loaded_at > REVOCATION_REFRESH_SECONDS:
+        load_revocations()
+    if ticket['reservation_id'] in _revoked_reservations:
+        return ticket, 'Ticket has been refunded or cancelled'
+
+    return ticket, None
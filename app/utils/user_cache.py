@@ -0,0 +1,61 @@
+# utils/user_cache.py
+from dataclasses import dataclass
+
+from flask_login import UserMixin
+from app import db
+from app.models import User
+from app.utils.cache import TTLCache
+
+# Flask-Login reloads the user on every authenticated request. Views and
+# templates only read user_id, name, email and role from current_user, so
+# the loader serves a cached snapshot of those instead of querying users.
+# Snapshots are dropped on login, logout and role changes in this process;
+# the TTL bounds how long a change made by another worker can go unseen
+# (up to USER_CACHE_TTL seconds). Admin access doesn't rely on the snapshot:
+# role_required('admin') confirms the role with current_role on each request.
+
+USER_CACHE_SIZE = 10000
+USER_CACHE_TTL = 60
+
+_user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+
+
+@dataclass(frozen=True)
+class UserIdentity(UserMixin):
+    user_id: int
+    name: str
+    email: str
+    role: str
+
+    def get_id(self):
+        return str(self.user_id)
+
+
+def load_identity(user_id):
+    """Cached identity for a user id, or None if the user no longer exists."""
+    identity = _user_cache.get(user_id)
+    if identity is None:
+        row = db.session.query(User.user_id, User.name, User.email, User.role).filter(
+            User.user_id == user_id
+        ).first()
+        if row is None:
+            return None
+        identity = UserIdentity(*row)
+        _user_cache.set(user_id, identity)
+    return identity
+
+
+def forget_user(user_id):
+    _user_cache.pop(user_id)
+
+
+def current_role(user_id):
+    """The user's role as stored now (one primary-key lookup), or None if deleted.
+
+    A stale snapshot for this user is dropped when the role no longer matches.
+    """
+    role = db.session.query(User.role).filter(User.user_id == user_id).scalar()
+    identity = _user_cache.get(user_id)
+    if identity is not None and identity.role != role:
+        forget_user(user_id)
+    return role
@@ -0,0 +1,168 @@
+# utils/user_search.py
+import re
+import threading
+import time
+
+from sqlalchemy import column, func, literal_column, table, text
+from app import db
+from app.models import Reservation, User
+
+# Ranked, paginated user search for the admin users page, backed by whatever
+# index the database offers:
+#
+#   mysql   FULLTEXT index ft_users_name_email, MATCH ... AGAINST in boolean mode
+#   sqlite  FTS5 table users_fts kept in sync with users by triggers
+#   other   an in-process trigram index over (user_id, name, email, role)
+#
+# The FULLTEXT index is declared on User (MySQL only), so db.create_all()
+# builds it too; the FTS5 table and its triggers come from migration
+# 9a6d3e5b2c71. A database found without its index uses the trigram index.
+
+USERS_PER_PAGE = 25
+
+# InnoDB ignores words shorter than innodb_ft_min_token_size (3 by default),
+# so shorter terms are matched as a prefix of the uniquely indexed email.
+MYSQL_MIN_TOKEN = 3
+
+TRIGRAM_REFRESH_SECONDS = 300
+
+users_fts = table('users_fts', column('rowid'))
+
+_index_available = None
+_trigram_lock = threading.Lock()
+_trigram_index = None
+_trigram_built_at = None
+
+
+INDEX_PROBES = {
+    'mysql': "SELECT 1 FROM information_schema.statistics WHERE table_schema = DATABASE() "
+             "AND table_name = 'users' AND index_name = 'ft_users_name_email' LIMIT 1",
+    'sqlite': "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'users_fts'",
+}
+
+
+def _backend():
+    global _index_available
+    dialect = db.session.get_bind().dialect.name
+    if dialect in INDEX_PROBES:
+        if _index_available is None:
+            _index_available = db.session.execute(text(INDEX_PROBES[dialect])).first() is not None
+        if _index_available:
+            return dialect
+    return 'trigram'
+
+
+def _words(term):
+    return [word for word in re.split(r'\s+', term.strip()) if word]
+
+
+def _fts5_query(term):
+    # Each word as a quoted prefix phrase, so punctuation in emails can't be
+    # read as FTS5 syntax; "john@ex"* matches the tokens john, ex...
+    return ' '.join('"{}"*'.format(word.replace('"', '""')) for word in _words(term))
+
+
+def _mysql_query(term):
+    # InnoDB splits on punctuation, so john@example.com is +john* +example* +com*
+    return ' '.join(f'+{token}*' for token in re.findall(r'\w+', term))
+
+
+def _trigrams(value):
+    return {value[i:i + 3] for i in range(len(value) - 2)}
+
+
+class TrigramIndex:
+    """Substring search over users held in memory.
+
+    Each user's "name email" text is broken into three-character grams; a
+    search intersects the id sets of the term's grams, confirms the substring
+    and ranks exact and prefix matches first. Terms under three characters
+    scan the in-memory rows.
+    """
+
+    def __init__(self, rows):
+        self.users = {}
+        self.grams = {}
+        for user_id, name, email, role in rows:
+            text_value = f"{name} {email}".lower()
+            self.users[user_id] = (text_value, name.lower(), email.lower(), role)
+            for gram in _trigrams(text_value):
+                self.grams.setdefault(gram, set()).add(user_id)
+
+    def search(self, term, role=None):
+        term = term.lower().strip()
+        grams = _trigrams(term)
+        if grams:
+            candidates = set.intersection(*(self.grams.get(g, set()) for g in grams))
+        else:
+            candidates = self.users.keys()
+
+        matches = []
+        for user_id in candidates:
+            text_value, name, email, user_role = self.users[user_id]
+            if role and user_role != role:
+                continue
+            position = text_value.find(term)
+            if position < 0:
+                continue
+            exact = term in (name, email)
+            prefix = name.startswith(term) or email.startswith(term)
+            matches.append((not exact, not prefix, position, user_id))
+        return [match[-1] for match in sorted(matches)]
+
+
+def _trigram_search():
+    global _trigram_index, _trigram_built_at
+    with _trigram_lock:
+        if _trigram_index is None or time.monotonic() - _trigram_built_at > TRIGRAM_REFRESH_SECONDS:
+            rows = db.session.query(User.user_id, User.name, User.email, User.role).all()
+            _trigram_index = TrigramIndex(rows)
+            _trigram_built_at = time.monotonic()
+        return _trigram_index
+
+
+def search_users(term='', role=None, page=1, per_page=USERS_PER_PAGE):
+    """Return (users, total) for one page of users matching term, best matches first.
+
+    Without a term this lists users by id, filtered by role if given.
+    """
+    page = max(page, 1)
+    words = _words(term)
+    query = User.query
+    if role:
+        query = query.filter(User.role == role)
+
+    if not words:
+        query = query.order_by(User.user_id)
+    else:
+        backend = _backend()
+        if backend == 'trigram':
+            ids = _trigram_search().search(' '.join(words), role=role)
+            page_ids = ids[(page - 1) * per_page:page * per_page]
+            users = {user.user_id: user for user in User.query.filter(User.user_id.in_(page_ids))} if page_ids else {}
+            return [users[user_id] for user_id in page_ids if user_id in users], len(ids)
+
+        if backend == 'sqlite':
+            match = _fts5_query(term)
+            query = query.join(users_fts, users_fts.c.rowid == User.user_id).filter(
+                literal_column('users_fts').op('MATCH')(match)
+            ).order_by(func.bm25(literal_column('users_fts')), User.user_id)
+        elif len(words) == 1 and len(words[0]) < MYSQL_MIN_TOKEN:
+            query = query.filter(User.email.startswith(words[0], autoescape=True)).order_by(User.email)
+        else:
+            from sqlalchemy.dialects.mysql import match
+            relevance = match(User.name, User.email, against=_mysql_query(term)).in_boolean_mode()
+            query = query.filter(relevance).order_by(relevance.desc(), User.user_id)
+
+    total = query.order_by(None).count()
+    users = query.offset((page - 1) * per_page).limit(per_page).all()
+    return users, total
+
+
+def booking_counts(user_ids):
+    """{user_id: reservations} for the given users, in one grouped query."""
+    if not user_ids:
+        return {}
+    return dict(db.session.query(
+        Reservation.user_id, func.count(Reservation.reservation_id)
+    ).filter(Reservation.user_id.in_(user_ids)).group_by(Reservation.user_id).all())
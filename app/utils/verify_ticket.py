@@ -0,0 +1,38 @@
+import sys
+import os
+import argparse
+import json
+
+# Add project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from config import Config
+from app.utils.ticket_token import decode_ticket_token
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify ticket QR tokens offline using the signing key only.")
+    parser.add_argument('tokens', nargs='+', help="token(s) read from ticket QR codes")
+    parser.add_argument('--revoked', default='', help="comma-separated reservation ids to treat as revoked")
+    args = parser.parse_args()
+
+    revoked = {int(r) for r in args.revoked.split(',') if r.strip()}
+    exit_code = 0
+    for token in args.tokens:
+        ticket = decode_ticket_token(token, Config.TICKET_SIGNING_KEY)
+        if ticket is None:
+            print(f"INVALID  {token}")
+            exit_code = 1
+        elif ticket['reservation_id'] in revoked:
+            print(f"REVOKED  {json.dumps(ticket)}")
+            exit_code = 1
+        else:
+            print(f"VALID    {json.dumps(ticket)}")
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
+# Usage: python app/utils/verify_ticket.py <token> [<token> ...] [--revoked 12,15]
@@ -0,0 +1,35 @@
+# utils/warmup.py
+from sqlalchemy.orm import configure_mappers
+from app import db
+from app.models import Airline, Airport
+from app.utils.pdf_layout import warm_layouts
+from app.utils.user_cache import load_identity
+
+# Work a fresh process would otherwise do on its first requests. wsgi.py
+# runs this at import time, so with gunicorn's preload_app it happens once
+# in the master and every forked worker starts with it done.
+
+
+def _prime_statements():
+    # Run the queries behind the most common first requests once so their
+    # compiled SQL sits in the engine's statement cache.
+    load_identity(0)
+    Airline.query.all()
+    db.session.query(Airport.country).distinct().all()
+
+
+def warm_up(app):
+    with app.app_context():
+        configure_mappers()
+
+        for name in app.jinja_env.list_templates(extensions=['html']):
+            app.jinja_env.get_template(name)
+
+        warm_layouts()
+        _prime_statements()
+
+        # Forked workers must not share the master's sockets; disposing keeps
+        # the compiled statement cache but leaves every pool empty.
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
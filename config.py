@@ -7,3 +7,95 @@ class Config:
     SECRET_KEY = os.getenv("SECRET_KEY")
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Connection pool. pre_ping and recycle keep idle connections from
+    # hitting "MySQL server has gone away"; recycle must stay below the
+    # server's wait_timeout.
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", 10)),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 20)),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", 10)),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", 1800)),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() == "true",
+    }
+    # Optional read replica for search and reporting views. After a write the
+    # user's reads stay on the primary for REPLICA_STICKY_SECONDS, which
+    # should cover the replica's usual lag.
+    DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+    SQLALCHEMY_BINDS = {"replica": DATABASE_REPLICA_URL} if DATABASE_REPLICA_URL else {}
+    REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", 10))
+
+    # Per-statement time limit in milliseconds (MySQL applies it to SELECTs); 0 disables it
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 0))
+
+    # Key used to sign ticket QR codes; defaults to SECRET_KEY
+    TICKET_SIGNING_KEY = os.getenv("TICKET_SIGNING_KEY") or SECRET_KEY
+
+    # Render processes used for flight-wide ticket downloads. Each web worker
+    # starts its own pool of this size on its first large download, so the
+    # host runs up to GUNICORN_WORKERS times this many; keep it small.
+    TICKET_RENDER_WORKERS = int(os.getenv("TICKET_RENDER_WORKERS", 2))
+
+    # Password hashing: "scrypt" or "pbkdf2:sha256", and its cost (pbkdf2
+    # iterations or scrypt N); unset uses Werkzeug's default. Hashes made with
+    # other parameters are upgraded on the user's next successful login.
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt")
+    PASSWORD_HASH_ITERATIONS = int(os.getenv("PASSWORD_HASH_ITERATIONS")) if os.getenv("PASSWORD_HASH_ITERATIONS") else None
+
+    # Per-endpoint request, SQL and template timings served at /metrics, off
+    # by default. Scrapers authenticate with "Authorization: Bearer
+    # <METRICS_TOKEN>"; without a token only a logged-in admin can read it.
+    # Counting rows buffers every ORM result an extra time, so it is separate.
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+    METRICS_COUNT_ROWS = os.getenv("METRICS_COUNT_ROWS", "false").lower() == "true"
+
+    # N+1 guard for tests and staging: "off", "log" (warning with a stack
+    # trace) or "raise" (the request fails after the view returns). Only the
+    # endpoints below are checked: each may run at most QUERY_BUDGETS[endpoint]
+    # statements, and no single SELECT shape more than QUERY_REPEAT_LIMIT times.
+    QUERY_BUDGET_MODE = os.getenv("QUERY_BUDGET_MODE", "off").lower()
+    QUERY_REPEAT_LIMIT = int(os.getenv("QUERY_REPEAT_LIMIT", 5))
+    QUERY_BUDGETS = {
+        "passenger.search_results": 12,
+        "passenger.view_bookings": 6,
+        "passenger.view_ticket": 4,
+        "passenger.dashboard": 6,
+        "admin.user_details": 8,
+    }
+
+    # Slow-query log: statements slower than the threshold are written, with
+    # their EXPLAIN plan, to a rotating JSONL file (default: instance folder)
+    SLOW_QUERY_LOG_ENABLED = os.getenv("SLOW_QUERY_LOG_ENABLED", "false").lower() == "true"
+    SLOW_QUERY_THRESHOLD_MS = int(os.getenv("SLOW_QUERY_THRESHOLD_MS", 200))
+    SLOW_QUERY_LOG_PATH = os.getenv("SLOW_QUERY_LOG_PATH")
+    SLOW_QUERY_LOG_MAX_BYTES = int(os.getenv("SLOW_QUERY_LOG_MAX_BYTES", 10 * 1024 * 1024))
+    SLOW_QUERY_LOG_BACKUPS = int(os.getenv("SLOW_QUERY_LOG_BACKUPS", 5))
+    # Also write bind values (never for statements touching password columns)
+    SLOW_QUERY_LOG_PARAMETERS = os.getenv("SLOW_QUERY_LOG_PARAMETERS", "false").lower() == "true"
+
+    # Number of reverse proxies in front of the app whose X-Forwarded-For /
+    # -Proto / -Host headers are trusted. Behind one proxy this must be 1,
+    # otherwise every client has the proxy's address and shares its IP buckets.
+    PROXY_FIX_HOPS = int(os.getenv("PROXY_FIX_HOPS", 0))
+
+    # Token-bucket rate limits per endpoint, as "<requests>/<second|minute|hour>"
+    # per client IP and per account (the submitted email, else the logged-in user).
+    # Buckets live in each worker process's memory, so with N gunicorn workers
+    # a client can get up to N times these rates.
+    RATELIMIT_ENABLED = os.getenv("RATELIMIT_ENABLED", "true").lower() == "true"
+    RATELIMITS = {
+        "auth.login": {
+            "methods": ["POST"],
+            "ip": os.getenv("RATELIMIT_LOGIN_IP", "20/minute"),
+            "account": os.getenv("RATELIMIT_LOGIN_ACCOUNT", "5/minute"),
+        },
+        "auth.register": {
+            "methods": ["POST"],
+            "ip": os.getenv("RATELIMIT_REGISTER_IP", "5/minute"),
+        },
+        "passenger.search_flights": {
+            "ip": os.getenv("RATELIMIT_SEARCH_IP", "60/minute"),
+            "account": os.getenv("RATELIMIT_SEARCH_ACCOUNT", "30/minute"),
+        },
+    }
@@ -0,0 +1,29 @@
+import multiprocessing
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+# Behind a reverse proxy, set PROXY_FIX_HOPS (config.py) so the app sees
+# client addresses from X-Forwarded-For rather than the proxy's.
+
+# Processes x threads is the number of requests served at once. Keep it
+# within DB_POOL_SIZE + DB_MAX_OVERFLOW per worker.
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+worker_class = "gthread"
+
+# Import the app and warm it (wsgi.py) in the master, then fork, so workers
+# share that memory copy-on-write and none of them starts cold.
+preload_app = True
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 60))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers now and then so slow leaks don't accumulate
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 5000))
+max_requests_jitter = 500
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
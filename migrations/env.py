@@ -90,9 +90,22 @@ def run_migrations_online():
                 directives[:] = []
                 logger.info('No changes in schema detected.')
 
+    # Leave out of autogenerate what the models can't describe for this
+    # database: indexes declared for another dialect (ddl_if), and the SQLite
+    # FTS5 tables behind user search, which migration 9a6d3e5b2c71 manages
+    def include_object(object, name, type_, reflected, compare_to):
+        if type_ == 'table' and reflected and compare_to is None and name.startswith('users_fts'):
+            return False
+        ddl_if = getattr(object, '_ddl_if', None)
+        if type_ == 'index' and ddl_if is not None and ddl_if.dialect is not None:
+            return ddl_if.dialect == context.get_bind().dialect.name
+        return True
+
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    if conf_args.get("include_object") is None:
+        conf_args["include_object"] = include_object
 
     connectable = get_engine()
 
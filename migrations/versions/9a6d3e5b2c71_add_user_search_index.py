@@ -0,0 +1,48 @@
+"""add user search index
+
+Revision ID: 9a6d3e5b2c71
+Revises: e4b7a2c91f05
+Create Date: 2026-10-19 14:41:09.527318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a6d3e5b2c71'
+down_revision = 'e4b7a2c91f05'
+branch_labels = None
+depends_on = None
+
+
+SQLITE_FTS = [
+    "CREATE VIRTUAL TABLE users_fts USING fts5(name, email, content='users', content_rowid='user_id')",
+    "CREATE TRIGGER users_fts_insert AFTER INSERT ON users BEGIN "
+    "INSERT INTO users_fts(rowid, name, email) VALUES (new.user_id, new.name, new.email); END",
+    "CREATE TRIGGER users_fts_delete AFTER DELETE ON users BEGIN "
+    "INSERT INTO users_fts(users_fts, rowid, name, email) VALUES ('delete', old.user_id, old.name, old.email); END",
+    "CREATE TRIGGER users_fts_update AFTER UPDATE OF name, email ON users BEGIN "
+    "INSERT INTO users_fts(users_fts, rowid, name, email) VALUES ('delete', old.user_id, old.name, old.email); "
+    "INSERT INTO users_fts(rowid, name, email) VALUES (new.user_id, new.name, new.email); END",
+    "INSERT INTO users_fts(users_fts) VALUES ('rebuild')",
+]
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'mysql':
+        op.create_index('ft_users_name_email', 'users', ['name', 'email'], mysql_prefix='FULLTEXT')
+    elif dialect == 'sqlite':
+        for statement in SQLITE_FTS:
+            op.execute(statement)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'mysql':
+        op.drop_index('ft_users_name_email', table_name='users')
+    elif dialect == 'sqlite':
+        for trigger in ('users_fts_insert', 'users_fts_delete', 'users_fts_update'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS users_fts")
@@ -0,0 +1,147 @@
+import json
+import os
+import tempfile
+
+# Config reads the environment at import time
+_db_file = os.path.join(tempfile.mkdtemp(), 'query_budget.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{_db_file}'
+os.environ['SECRET_KEY'] = 'test'
+os.environ['QUERY_BUDGET_MODE'] = 'raise'
+os.environ['QUERY_REPEAT_LIMIT'] = '5'
+os.environ['RATELIMIT_ENABLED'] = 'false'
+
+import pytest
+
+from app import create_app, db
+from app.models import Aircraft, Flight, Reservation, ReservationSeat, ReservationStatus, Seat, SeatClass, User
+from app.utils.create_test_data import create_test_data
+from app.utils.query_budget import QueryBudgetExceeded
+
+PASSENGERS = 7
+
+
+@pytest.fixture(scope='module')
+def app():
+    app = create_app()
+    app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+    with app.app_context():
+        db.create_all()
+    create_test_data()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+def _login(app, email, password):
+    client = app.test_client()
+    response = client.post('/auth/login', data={'email': email, 'password': password})
+    assert response.status_code == 302
+    return client
+
+
+@pytest.fixture
+def client(app):
+    return _login(app, 'john@example.com', 'password123')
+
+
+@pytest.fixture
+def admin_client(app):
+    return _login(app, 'admin@skylink.com', 'admin123')
+
+
+def test_budgets_cover_the_checked_endpoints(app):
+    assert set(app.config['QUERY_BUDGETS']) == {
+        'passenger.dashboard', 'passenger.view_bookings', 'passenger.view_ticket',
+        'passenger.search_results', 'admin.user_details',
+    }
+
+
+@pytest.mark.parametrize('endpoint', ['dashboard', 'bookings', 'ticket', 'search_results'])
+def test_passenger_budgeted_endpoints_within_budget(app, client, endpoint):
+    with app.app_context():
+        john = User.query.filter_by(email='john@example.com').one()
+        reservation = Reservation.query.filter_by(
+            user_id=john.user_id, status=ReservationStatus.Confirmed
+        ).order_by(Reservation.reservation_id).first()
+        assert reservation is not None
+        flight = Flight.query.join(ReservationSeat).filter(
+            ReservationSeat.reservation_id == reservation.reservation_id
+        ).first()
+        template = flight.flight_template
+        search_data = {
+            'departure_airport_id': template.departure_airport_id,
+            'arrival_airport_id': template.arrival_airport_id,
+            'departure_date': flight.departure_datetime.strftime('%Y-%m-%d'),
+            'return_date': None,
+            'trip_type': 'one-way',
+            'passengers': 1,
+            'seat_class': 'Economy',
+            'sort_by': 'departure_time',
+        }
+        urls = {
+            'dashboard': '/passenger/dashboard',
+            'bookings': '/passenger/bookings',
+            'ticket': f'/passenger/ticket/{reservation.reservation_id}',
+            'search_results': '/passenger/search/results',
+        }
+
+    if endpoint == 'search_results':
+        with client.session_transaction() as session:
+            session['search_data'] = search_data
+    response = client.get(urls[endpoint])
+    assert response.status_code == 200
+
+
+def test_admin_user_details_within_budget(app, admin_client):
+    with app.app_context():
+        john = User.query.filter_by(email='john@example.com').one()
+        url = f'/admin/users/{john.user_id}/details'
+    response = admin_client.get(url)
+    assert response.status_code == 200
+
+
+def test_booking_more_passengers_than_repeat_limit(app, client):
+    assert PASSENGERS > app.config['QUERY_REPEAT_LIMIT']
+    with app.app_context():
+        flight = Flight.query.first()
+        seat_ids = [seat_id for (seat_id,) in db.session.query(Seat.seat_id).join(
+            Aircraft, Seat.aircraft_id == Aircraft.aircraft_id
+        ).filter(
+            Aircraft.aircraft_id == flight.flight_template.aircraft_id,
+            Seat.class_ == SeatClass.Economy
+        ).limit(PASSENGERS)]
+        assert len(seat_ids) == PASSENGERS
+        before = Reservation.query.count()
+
+    session_data = {
+        'flight_id': flight.flight_id,
+        'search_data': {'seat_class': 'Economy', 'trip_type': 'one-way', 'passengers': PASSENGERS},
+        'passenger_data': [
+            {'first_name': 'Test', 'last_name': str(i), 'gender': 'Male', 'age': 30,
+             'passport_no': f'P{i}', 'contact_number': '0300'}
+            for i in range(PASSENGERS)
+        ],
+        'total_price': 100.0 * PASSENGERS,
+        'selected_seats': [str(seat_id) for seat_id in seat_ids],
+    }
+    response = client.post(
+        '/passenger/payment', query_string={'session_data': json.dumps(session_data)},
+        data={'card_number': '4111111111111111', 'card_holder': 'Test', 'expiry_month': '01',
+              'expiry_year': '2030', 'cvv': '123'}
+    )
+
+    assert response.status_code == 302
+    assert '/passenger/ticket/' in response.headers['Location']
+    with app.app_context():
+        assert Reservation.query.count() == before + 1
+
+
+def test_repeated_select_on_budgeted_endpoint_raises(app):
+    with app.test_request_context('/passenger/bookings'):
+        app.preprocess_request()
+        for flight_id in range(1, app.config['QUERY_REPEAT_LIMIT'] + 2):
+            db.session.get(Flight, flight_id)
+            db.session.expunge_all()
+        with pytest.raises(QueryBudgetExceeded, match='same SELECT'):
+            app.process_response(app.response_class())
@@ -0,0 +1,8 @@
+from app import create_app
+from app.utils.warmup import warm_up
+
+app = create_app()
+warm_up(app)
+
+# Production entry point: gunicorn -c gunicorn.conf.py wsgi:app
+# run.py remains the development server.